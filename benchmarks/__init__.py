@@ -0,0 +1,7 @@
+"""Бенчмарки Yatube. Запускаются из корня репозитория:
+
+    python -m benchmarks.feed_indexes   # планы и время запросов лент
+    python -m benchmarks.load           # задержки и пропускная способность
+    python -m benchmarks.feed_rows      # модели против строк PostRow
+    python -m benchmarks.url_reverse    # reverse() против fast_reverse()
+"""
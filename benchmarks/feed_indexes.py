@@ -0,0 +1,73 @@
+"""Сравнивает планы и время запросов лент с индексами Post и без них.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.feed_indexes --posts 200000
+"""
+import argparse
+
+from .utils import measure, median, seed, setup_django
+
+
+def feed_queries():
+    """Запросы лент в том виде, в каком их строят views и пагинаторы."""
+    from posts.models import Group, Post, User
+    from posts.paginators import posts_after
+
+    author = User.objects.order_by('pk').first()
+    group = Group.objects.order_by('pk').first()
+    deep_post = Post.objects.for_feed()[5000:5001].get()
+    after_deep_post = posts_after(
+        Post.objects.for_feed(), deep_post.pub_date, deep_post.pk
+    )
+    return {
+        'index, page 1': Post.objects.for_feed()[:10],
+        'index, page 500': Post.objects.for_feed()[4990:5000],
+        'index, cursor': after_deep_post[:11],
+        'group, page 1': group.posts.for_feed()[:10],
+        'author, page 1': author.posts.for_feed()[:10],
+    }
+
+
+def set_feed_indexes(enabled):
+    """Создаёт или удаляет индексы лент (по pub_date) из Post.Meta.indexes."""
+    from django.db import connection
+
+    from posts.models import Post
+
+    with connection.schema_editor() as schema_editor:
+        for index in Post._meta.indexes:
+            if 'pub_date' not in index.fields:
+                continue
+            if enabled:
+                schema_editor.add_index(Post, index)
+            else:
+                schema_editor.remove_index(Post, index)
+
+
+def run(label, repeat):
+    print(f'\n== {label} ==')
+    for name, queryset in feed_queries().items():
+        timings = measure(lambda: list(queryset.all()), repeat)
+        plan = queryset.explain().replace('\n', '; ')
+        print(f'{name:<16} {median(timings):8.2f} ms  {plan}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--groups', type=int, default=50)
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    seed(args.users, args.groups, args.posts)
+    set_feed_indexes(False)
+    run('без индексов', args.repeat)
+    set_feed_indexes(True)
+    run('с индексами', args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Сравнивает страницу ленты из моделей Post и из строк PostRow.
+
+Меряет время выборки и рендеринга страницы и пик памяти на выборку.
+Запуск из корня репозитория:
+
+    python -m benchmarks.feed_rows --per-page 10 100
+"""
+import argparse
+import tracemalloc
+
+from .utils import measure, median, seed, setup_django
+
+
+def querysets():
+    from posts.models import Post
+
+    return {
+        'модели Post': Post.objects.for_feed(),
+        'строки PostRow': Post.objects.feed_rows(),
+    }
+
+
+def peak_memory(func):
+    """Пик памяти вызова func в КиБ."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def render_page(queryset, per_page, count):
+    """Вторая страница главной, как её собирает view index.
+
+    Размер ленты берётся из счётчика, как в views, а не COUNT(*)
+    по queryset: у values_list в нём остались бы JOIN автора и группы.
+    """
+    from django.template.loader import render_to_string
+
+    from posts.counters import CountedPaginator
+
+    page = CountedPaginator(queryset, per_page, count).page(2)
+    return render_to_string('posts/index.html', {'page_obj': page})
+
+
+def run(per_page, repeat):
+    from posts.counters import INDEX_FEED, get_count
+    from posts.models import Post
+
+    print(f'\n== {per_page} постов на странице ==')
+    count = get_count(INDEX_FEED, Post.objects.all())
+    for name, queryset in querysets().items():
+        def fetch():
+            return list(queryset.all()[per_page:per_page * 2])
+
+        fetch_ms = median(measure(fetch, repeat))
+        render_ms = median(
+            measure(
+                lambda: render_page(queryset.all(), per_page, count), repeat
+            )
+        )
+        memory = peak_memory(fetch)
+        print(
+            f'{name:<16} выборка {fetch_ms:7.2f} мс  '
+            f'рендеринг {render_ms:7.2f} мс  память {memory:8.1f} КиБ'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--groups', type=int, default=50)
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--per-page', type=int, nargs='+', default=[10, 100])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    seed(args.users, args.groups, args.posts)
+    for per_page in args.per_page:
+        run(per_page, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""Нагрузочный бенчмарк страниц приложения posts.
+
+Заполняет временную базу, прогоняет запросы к view через тестовый
+клиент Django внутри процесса и печатает p50/p95/p99, запросы в секунду
+и число SQL-запросов на запрос отдельно для гостя и вошедшего автора:
+кеш страниц и условные GET работают только для гостей. Сценарий
+«гость + запись» читает главную, пока автор каждым десятым запросом
+публикует пост и сбрасывает её кеш. С --cached включаются кеш страниц,
+условные GET, материализованные ленты и строки PostRow, как в prod.
+Результат можно сохранить в JSON и сравнить с сохранённым ранее:
+
+    python -m benchmarks.load --posts 50000 --output baseline.json
+    python -m benchmarks.load --posts 50000 --compare baseline.json
+    python -m benchmarks.load --posts 50000 --cached --compare baseline.json
+"""
+import argparse
+import json
+import time
+
+from .utils import fake_texts, percentile, seed, setup_django
+
+METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'rps', 'queries')
+
+# Настройки prod, которые ускоряют чтение лент.
+CACHED_SETTINGS = {
+    'POSTS_PAGE_CACHE': True,
+    'POSTS_CONDITIONAL_GET': True,
+    'POSTS_TIMELINES': True,
+    'POSTS_FEED_ROWS': True,
+}
+
+
+def revisit(client, url):
+    """i-й повторный визит браузера, присылающего валидаторы копии."""
+    validators = {}
+
+    def request(i):
+        response = client.get(url, **validators)
+        if response.status_code == 200:
+            validators.clear()
+            if response.has_header('ETag'):
+                validators['HTTP_IF_NONE_MATCH'] = response['ETag']
+            if response.has_header('Last-Modified'):
+                validators['HTTP_IF_MODIFIED_SINCE'] = (
+                    response['Last-Modified']
+                )
+        return response
+    return request
+
+
+def scenarios(guest, client):
+    """Сценарии: имя и функция, выполняющая i-й запрос.
+
+    guest — клиент без входа, client — клиент, вошедший автором.
+    """
+    from django.urls import reverse
+
+    from posts.models import Group, Post, User
+
+    author = User.objects.order_by('pk').first()
+    group = Group.objects.order_by('pk').first()
+    post_ids = list(
+        Post.objects.filter(author=author).values_list('pk', flat=True)[:100]
+    )
+    client.force_login(author)
+
+    def get(url, user=client):
+        return lambda i: user.get(url)
+
+    def guest_post_detail(i):
+        post_id = post_ids[i % len(post_ids)]
+        return guest.get(
+            reverse('posts:post_detail', kwargs={'post_id': post_id})
+        )
+
+    def post_detail(i):
+        post_id = post_ids[i % len(post_ids)]
+        return client.get(
+            reverse('posts:post_detail', kwargs={'post_id': post_id})
+        )
+
+    def post_create(i):
+        return client.post(
+            reverse('posts:post_create'),
+            {'text': f'Нагрузочный пост {i}', 'group': group.pk},
+        )
+
+    def post_edit(i):
+        post_id = post_ids[i % len(post_ids)]
+        return client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post_id}),
+            {'text': f'Отредактировано {i}', 'group': group.pk},
+        )
+
+    def guest_with_writes(i):
+        if i % 10 == 0:
+            return post_create(i)
+        return guest.get(reverse('posts:index'))
+
+    index = reverse('posts:index')
+    group_list = reverse('posts:group_list', kwargs={'slug': group.slug})
+    profile = reverse('posts:profile', kwargs={'username': author.username})
+    return {
+        'гость index': get(index, guest),
+        'гость index p100': get(index + '?page=100', guest),
+        'гость group_posts': get(group_list, guest),
+        'гость profile': get(profile, guest),
+        'гость post_detail': guest_post_detail,
+        'гость повтор index': revisit(guest, index),
+        'гость + запись': guest_with_writes,
+        'автор index': get(index),
+        'автор index p100': get(index + '?page=100'),
+        'автор group_posts': get(group_list),
+        'автор profile': get(profile),
+        'автор post_detail': post_detail,
+        'автор post_create': post_create,
+        'автор post_edit': post_edit,
+    }
+
+
+def run_scenario(request, count, warmup):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    for i in range(warmup):
+        request(i)
+    timings = []
+    queries = 0
+    started = time.perf_counter()
+    for i in range(count):
+        with CaptureQueriesContext(connection) as context:
+            request_started = time.perf_counter()
+            response = request(i)
+            timings.append((time.perf_counter() - request_started) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError(f'Ответ {response.status_code}')
+        queries += len(context)
+    elapsed = time.perf_counter() - started
+    return {
+        'p50_ms': percentile(timings, 50),
+        'p95_ms': percentile(timings, 95),
+        'p99_ms': percentile(timings, 99),
+        'rps': count / elapsed,
+        'queries': queries / count,
+    }
+
+
+def print_results(results, baseline=None):
+    header = f'{"сценарий":<20}' + ''.join(f'{name:>16}' for name in METRICS)
+    print(header)
+    for name, metrics in results.items():
+        cells = []
+        for metric in METRICS:
+            cell = f'{metrics[metric]:.2f}'
+            if baseline and name in baseline:
+                old = baseline[name][metric]
+                if old:
+                    cell += f' ({(metrics[metric] - old) / old:+.0%})'
+            cells.append(f'{cell:>16}')
+        print(f'{name:<20}' + ''.join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--groups', type=int, default=20)
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument(
+        '--cached',
+        action='store_true',
+        help='Включить кеши и условные GET, как в prod.',
+    )
+    parser.add_argument('--output', help='Сохранить результат в JSON.')
+    parser.add_argument('--compare', help='JSON с прошлым результатом.')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    seed(args.users, args.groups, args.posts, texts=fake_texts())
+    with override_settings(**(CACHED_SETTINGS if args.cached else {})):
+        results = {
+            name: run_scenario(request, args.requests, args.warmup)
+            for name, request in scenarios(Client(), Client()).items()
+        }
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+    print_results(results, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'params': vars(args), 'results': results},
+                file,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(BASE_DIR, 'yatube')
+
+
+def setup_django():
+    """Настраивает Django и создаёт пустую тестовую базу в памяти.
+
+    Бенчмарки никогда не трогают рабочий db.sqlite3.
+    """
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    import django
+    django.setup()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+
+def fake_texts(seed_value=0):
+    """Бесконечный поток текстов постов от Faker, как в tests/fixtures."""
+    from faker import Faker
+
+    fake = Faker('ru_RU')
+    fake.seed_instance(seed_value)
+    while True:
+        yield fake.paragraph(nb_sentences=3)
+
+
+def seed(users, groups, posts, batch_size=5000, seed_value=0, texts=None):
+    """Заполняет базу пользователями, группами и постами.
+
+    Даты постов случайно раскиданы по последнему году. Счётчики
+    пересчитываются целиком, потому что bulk_create не шлёт сигналы.
+    texts — итератор текстов постов, по умолчанию короткие заглушки.
+    """
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+    from django.utils import timezone
+
+    from posts.counters import rebuild_counts
+    from posts.management.commands.import_posts import keep_pub_date
+    from posts.models import Group, Post
+
+    User = get_user_model()
+    rng = random.Random(seed_value)
+    User.objects.bulk_create(
+        User(username=f'user{i}', first_name='Имя', last_name=f'{i}')
+        for i in range(users)
+    )
+    Group.objects.bulk_create(
+        Group(title=f'Группа {i}', slug=f'group-{i}', description='-')
+        for i in range(groups)
+    )
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    group_ids = list(Group.objects.values_list('pk', flat=True)) + [None]
+    start = timezone.now() - timedelta(days=365)
+    with transaction.atomic(), keep_pub_date():
+        for offset in range(0, posts, batch_size):
+            Post.objects.bulk_create(
+                Post(
+                    text=next(texts) if texts else f'Текст поста {number}',
+                    pub_date=start + timedelta(
+                        seconds=rng.randrange(365 * 86400)
+                    ),
+                    author_id=rng.choice(user_ids),
+                    group_id=rng.choice(group_ids),
+                )
+                for number in range(offset, min(offset + batch_size, posts))
+            )
+    rebuild_counts()
+
+
+def measure(func, repeat):
+    """Возвращает время вызовов func в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def median(timings):
+    return statistics.median(timings)
+
+
+def percentile(timings, percent):
+    """Перцентиль методом ближайшего ранга."""
+    ordered = sorted(timings)
+    rank = max(0, -(-len(ordered) * percent // 100) - 1)
+    return ordered[int(rank)]
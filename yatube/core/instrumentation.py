@@ -0,0 +1,91 @@
+import time
+from contextvars import ContextVar
+
+from django.template import base
+
+_current = ContextVar('request_stats', default=None)
+_original_render = base.Template.render
+
+
+class RequestStats:
+    """Счётчики одного запроса: SQL и рендеринг шаблонов.
+
+    С profile_templates=True дополнительно собирает по каждому шаблону
+    и include число рендеров, полное время и время без вложенных шаблонов.
+    """
+
+    def __init__(self, profile_templates=False):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        # Время вложенных шаблонов текущего рендера, для собственного
+        # времени родителя.
+        self.children_time = 0.0
+        self.templates = {} if profile_templates else None
+
+    def record_query(self, execute, sql, params, many, context):
+        """Обёртка для connection.execute_wrapper()."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def template_rendered(self, template, elapsed, own, depth):
+        # Вложенные include уже входят во время родительского шаблона.
+        if depth == 0:
+            self.template_time += elapsed
+        if self.templates is None:
+            return
+        name = template.name or '<string>'
+        profile = self.templates.setdefault(
+            name, {'calls': 0, 'total': 0.0, 'own': 0.0}
+        )
+        profile['calls'] += 1
+        profile['total'] += elapsed
+        profile['own'] += own
+
+    def template_profile(self):
+        """Профиль шаблонов, самые дорогие по собственному времени первыми."""
+        return sorted(
+            self.templates.items(),
+            key=lambda item: item[1]['own'],
+            reverse=True,
+        )
+
+
+def _timed_render(template, context):
+    stats = _current.get()
+    if stats is None:
+        return _original_render(template, context)
+    depth = stats.template_depth
+    stats.template_depth += 1
+    children_time = stats.children_time
+    stats.children_time = 0.0
+    started = time.perf_counter()
+    try:
+        return _original_render(template, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        own = elapsed - stats.children_time
+        stats.template_depth = depth
+        stats.children_time = children_time + elapsed
+        stats.template_rendered(template, elapsed, own, depth)
+
+
+def install():
+    """Подменяет Template.render замером времени; повторный вызов безопасен.
+
+    Без активного RequestStats подмена сразу вызывает исходный метод.
+    """
+    base.Template.render = _timed_render
+
+
+def activate(stats):
+    return _current.set(stats)
+
+
+def deactivate(token):
+    _current.reset(token)
@@ -0,0 +1,137 @@
+import threading
+from bisect import bisect_left
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (
+    1024, 4096, 16384, 65536, 262144, 1048576, 4194304
+)
+RATIO_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1)
+CPU_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1
+)
+
+
+class Histogram:
+    """Гистограмма в памяти процесса в духе Prometheus.
+
+    Серии различаются метками, например именем view.
+    """
+
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    'buckets': [0] * (len(self.buckets) + 1),
+                    'sum': 0.0,
+                    'count': 0,
+                }
+            series['buckets'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def snapshot(self):
+        """Копия серий по меткам: buckets, sum и count."""
+        with self._lock:
+            return {
+                key: {**series, 'buckets': list(series['buckets'])}
+                for key, series in self._series.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def exposition(self):
+        """Строки текстового формата Prometheus."""
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} histogram',
+        ]
+        for key, series in sorted(self.snapshot().items()):
+            labels = ','.join(
+                f'{name}="{escape_label(value)}"' for name, value in key
+            )
+            prefix = f'{labels},' if labels else ''
+            cumulative = 0
+            bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+            for bound, count in zip(bounds, series['buckets']):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+                )
+            lines.append(f'{self.name}_sum{{{labels}}} {series["sum"]}')
+            lines.append(f'{self.name}_count{{{labels}}} {series["count"]}')
+        return lines
+
+
+def escape_label(value):
+    return (
+        str(value).replace('\\', '\\\\').
+        replace('"', '\\"').replace('\n', '\\n')
+    )
+
+
+REGISTRY = []
+
+
+def histogram(name, documentation, buckets):
+    metric = Histogram(name, documentation, buckets)
+    REGISTRY.append(metric)
+    return metric
+
+
+request_duration = histogram(
+    'yatube_request_duration_seconds',
+    'Время обработки запроса view.',
+    DURATION_BUCKETS,
+)
+db_queries = histogram(
+    'yatube_db_queries',
+    'Число SQL-запросов на запрос.',
+    COUNT_BUCKETS,
+)
+db_duration = histogram(
+    'yatube_db_duration_seconds',
+    'Суммарное время SQL-запросов на запрос.',
+    DURATION_BUCKETS,
+)
+template_duration = histogram(
+    'yatube_template_duration_seconds',
+    'Время рендеринга шаблонов на запрос.',
+    DURATION_BUCKETS,
+)
+response_size = histogram(
+    'yatube_response_size_bytes',
+    'Размер тела ответа.',
+    SIZE_BUCKETS,
+)
+compression_ratio = histogram(
+    'yatube_compression_ratio',
+    'Доля размера тела после сжатия от исходного.',
+    RATIO_BUCKETS,
+)
+compression_cpu = histogram(
+    'yatube_compression_cpu_seconds',
+    'Процессорное время на сжатие тела ответа.',
+    CPU_BUCKETS,
+)
+
+
+def exposition():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.exposition())
+    return '\n'.join(lines) + '\n'
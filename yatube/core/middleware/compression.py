@@ -0,0 +1,179 @@
+import time
+import zlib
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+from core import metrics
+from core.middleware.static import accepted_encodings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    'application/javascript',
+    'application/json',
+    'application/x-ndjson',
+    'application/xml',
+    'image/svg+xml',
+}
+
+
+def compressible(response):
+    content_type = response.get('Content-Type', '').split(';')[0].strip()
+    return (
+        content_type.startswith('text/')
+        or content_type.endswith(('+json', '+xml'))
+        or content_type in COMPRESSIBLE_TYPES
+    )
+
+
+def choose_encoding(request):
+    """br или gzip из Accept-Encoding клиента, иначе None."""
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compressor(encoding):
+    """Функции (сжать кусок, вытолкнуть буфер, завершить поток)."""
+    if encoding == 'br':
+        stream = brotli.Compressor(
+            quality=settings.RESPONSE_COMPRESSION_BROTLI_QUALITY
+        )
+        return stream.process, stream.flush, stream.finish
+    # wbits 31 — поток с заголовком и контрольной суммой gzip.
+    stream = zlib.compressobj(
+        settings.RESPONSE_COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31
+    )
+    return (
+        stream.compress,
+        partial(stream.flush, zlib.Z_SYNC_FLUSH),
+        stream.flush,
+    )
+
+
+class CompressionStats:
+    """Байты до и после сжатия и процессорное время на него."""
+
+    def __init__(self, encoding, view):
+        self.encoding = encoding
+        self.view = view
+        self.original = 0
+        self.compressed = 0
+        self.cpu_time = 0.0
+
+    def run(self, func, data=None):
+        started = time.thread_time()
+        output = func() if data is None else func(data)
+        self.cpu_time += time.thread_time() - started
+        self.original += len(data or b'')
+        self.compressed += len(output)
+        return output
+
+    def observe(self):
+        if not self.original:
+            return
+        labels = {'view': self.view, 'encoding': self.encoding}
+        metrics.compression_ratio.observe(
+            self.compressed / self.original, **labels
+        )
+        metrics.compression_cpu.observe(self.cpu_time, **labels)
+
+
+class CompressionMiddleware:
+    """Сжимает ответы brotli или gzip по Accept-Encoding клиента.
+
+    В отличие от django.middleware.gzip умеет brotli (если установлен
+    пакет brotli) и сжимает StreamingHttpResponse по кускам, не собирая
+    тело в памяти. Не трогает короткие ответы, уже сжатые ответы
+    и несжимаемые типы вроде картинок. Степень сжатия и процессорное
+    время копятся в core.metrics по view и кодировке — по ним
+    подбираются уровни RESPONSE_COMPRESSION_*. Включается
+    RESPONSE_COMPRESSION.
+    """
+
+    def __init__(self, get_response):
+        if not settings.RESPONSE_COMPRESSION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.should_compress(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request)
+        if encoding is None:
+            return response
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        stats = CompressionStats(encoding, view)
+        if response.streaming:
+            response.streaming_content = self.compress_stream(
+                response.streaming_content, stats
+            )
+            del response['Content-Length']
+        else:
+            compress, _, finish = compressor(encoding)
+            content = stats.run(compress, response.content)
+            content += stats.run(finish)
+            stats.observe()
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+
+        # Сжатое тело отличается побайтно, поэтому строгий ETag
+        # становится слабым (RFC 7232, 2.1).
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    def should_compress(self, response):
+        if (
+            response.status_code == 206
+            or response.has_header('Content-Encoding')
+            or 'no-transform' in response.get('Cache-Control', '')
+            or not compressible(response)
+        ):
+            return False
+        if response.streaming:
+            # Длину потока знаем, только если её указал сам view.
+            size = response.get('Content-Length')
+        else:
+            size = len(response.content)
+        return (
+            size is None
+            or int(size) >= settings.RESPONSE_COMPRESSION_MIN_SIZE
+        )
+
+    def compress_stream(self, chunks, stats):
+        """Сжимает поток по кускам, не собирая тело в памяти.
+
+        Каждые RESPONSE_COMPRESSION_FLUSH_SIZE байт сжатое выталкивается
+        flush: без него zlib копит мелкие куски, например строки
+        выгрузки, и клиент долго не получает ничего.
+        """
+        compress, flush, finish = compressor(stats.encoding)
+        pending = 0
+        for chunk in chunks:
+            data = stats.run(compress, chunk)
+            pending += len(chunk)
+            if pending >= settings.RESPONSE_COMPRESSION_FLUSH_SIZE:
+                data += stats.run(flush)
+                pending = 0
+            if data:
+                yield data
+        yield stats.run(finish)
+        stats.observe()
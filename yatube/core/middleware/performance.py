@@ -0,0 +1,79 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core import instrumentation, metrics
+
+logger = logging.getLogger('core.templates')
+
+
+class PerformanceMiddleware:
+    """Замеряет время view, SQL, шаблонов и размер ответа.
+
+    Отдаёт замеры клиенту в заголовке Server-Timing и копит их
+    в гистограммах core.metrics по имени view. С TEMPLATE_PROFILING
+    в Server-Timing и лог core.templates попадает профиль шаблонов.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        instrumentation.install()
+
+    def __call__(self, request):
+        stats = instrumentation.RequestStats(
+            profile_templates=settings.TEMPLATE_PROFILING
+        )
+        token = instrumentation.activate(stats)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(stats.record_query)
+                    )
+                response = self.get_response(request)
+        finally:
+            instrumentation.deactivate(token)
+        duration = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        metrics.request_duration.observe(duration, view=view)
+        metrics.db_queries.observe(stats.queries, view=view)
+        metrics.db_duration.observe(stats.db_time, view=view)
+        metrics.template_duration.observe(stats.template_time, view=view)
+        if not response.streaming:
+            metrics.response_size.observe(len(response.content), view=view)
+
+        timings = [
+            f'app;dur={duration * 1000:.1f}',
+            f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} SQL"',
+            f'tpl;dur={stats.template_time * 1000:.1f}',
+        ]
+        if stats.templates:
+            timings.extend(self.profile_timings(request, stats))
+        if response.has_header('Server-Timing'):
+            timings.insert(0, response['Server-Timing'])
+        response['Server-Timing'] = ', '.join(timings)
+        return response
+
+    def profile_timings(self, request, stats):
+        profile = stats.template_profile()
+        logger.info(
+            'Профиль шаблонов %s:\n%s',
+            request.get_full_path(),
+            '\n'.join(
+                f'{data["own"] * 1000:8.2f} мс собств. '
+                f'{data["total"] * 1000:8.2f} мс всего '
+                f'{data["calls"]:5d} раз  {name}'
+                for name, data in profile
+            ),
+        )
+        return [
+            f'tpl.{number};dur={data["own"] * 1000:.1f};'
+            f'desc="{name} x{data["calls"]}"'
+            for number, (name, data) in enumerate(profile, start=1)
+        ]
@@ -0,0 +1,111 @@
+import logging
+import random
+import re
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('core.queries')
+
+WHITESPACE_RE = re.compile(r'\s+')
+IN_LIST_RE = re.compile(r'\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)', re.IGNORECASE)
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+
+def fingerprint(sql):
+    """Нормализует SQL: литералы и списки IN заменяются заглушками.
+
+    Запросы, отличающиеся только значениями, получают один отпечаток.
+    """
+    sql = WHITESPACE_RE.sub(' ', sql).strip()
+    sql = STRING_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    return IN_LIST_RE.sub('IN (...)', sql)
+
+
+class QueryRecorder:
+    """Обёртка для connection.execute_wrapper(), копящая отпечатки SQL."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - started) * 1000
+            self.queries.append((fingerprint(sql), sql, duration))
+
+    def duplicates(self, threshold):
+        """{отпечаток: число повторов} для повторяющихся запросов."""
+        counts = defaultdict(int)
+        for query_fingerprint, _, _ in self.queries:
+            counts[query_fingerprint] += 1
+        return {
+            query_fingerprint: count
+            for query_fingerprint, count in counts.items()
+            if count >= threshold
+        }
+
+    def slow(self, threshold_ms):
+        return [
+            (sql, duration)
+            for _, sql, duration in self.queries
+            if duration >= threshold_ms
+        ]
+
+    @property
+    def total_ms(self):
+        return sum(duration for _, _, duration in self.queries)
+
+
+class QueryInspectorMiddleware:
+    """Ищет повторяющиеся и медленные SQL-запросы в выборке запросов.
+
+    Включается ненулевым QUERY_INSPECTOR_SAMPLE_RATE. Находки пишутся
+    в лог core.queries и в request.query_problems.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSPECTOR_SAMPLE_RATE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.QUERY_INSPECTOR_SAMPLE_RATE:
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        request.query_problems = self.inspect(recorder)
+        if request.query_problems:
+            logger.warning(
+                '%s %s: %s',
+                request.method,
+                request.get_full_path(),
+                '; '.join(request.query_problems),
+            )
+        return response
+
+    def inspect(self, recorder):
+        problems = []
+        duplicates = recorder.duplicates(settings.QUERY_INSPECTOR_DUPLICATES)
+        for query_fingerprint, count in duplicates.items():
+            problems.append(f'{count} раз: {query_fingerprint}')
+        slow = recorder.slow(settings.QUERY_INSPECTOR_SLOW_QUERY_MS)
+        for sql, duration in slow:
+            problems.append(f'медленный запрос {duration:.1f} мс: {sql}')
+        if recorder.total_ms >= settings.QUERY_INSPECTOR_SLOW_REQUEST_MS:
+            problems.append(
+                f'{len(recorder.queries)} запросов '
+                f'за {recorder.total_ms:.1f} мс'
+            )
+        return problems
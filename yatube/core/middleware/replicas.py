@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from core import routers
+
+PIN_COOKIE = 'primary_db'
+
+
+class ReplicaMiddleware:
+    """Включает чтение с реплик для GET-запросов к view с use_replica.
+
+    Запрос, записавший что-либо в базу, ставит cookie, и следующие
+    DATABASE_REPLICA_PIN_SECONDS секунд клиент читает с основной
+    базы: автор сразу видит свой пост, пока реплики догоняют.
+    Без DATABASE_REPLICAS middleware отключается.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routing = routers.RequestRouting()
+        token = routers.activate(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.deactivate(token)
+        if routing.wrote:
+            response.set_cookie(
+                PIN_COOKIE,
+                '1',
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in ('GET', 'HEAD')
+            and getattr(view_func, 'use_replica', False)
+            and PIN_COOKIE not in request.COOKIES
+        ):
+            routers.current().replica = routers.choose_replica()
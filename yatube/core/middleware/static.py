@@ -0,0 +1,130 @@
+import mimetypes
+import os
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_vary_headers
+)
+from django.utils.http import http_date
+
+# Кодировки в порядке предпочтения и суффиксы их файлов.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Файлы с хешем в имени не меняются, их можно кешировать навсегда.
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме явно запрещённых q=0."""
+    encodings = set()
+    for item in header.split(','):
+        encoding, _, params = item.strip().partition(';')
+        params = params.replace(' ', '')
+        if params in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        encodings.add(encoding.strip().lower())
+    return encodings
+
+
+class StaticFile:
+    def __init__(self, path, immutable):
+        self.path = path
+        self.immutable = immutable
+        content_type, _ = mimetypes.guess_type(path)
+        self.content_type = content_type or 'application/octet-stream'
+        stat = os.stat(path)
+        self.last_modified = int(stat.st_mtime)
+        self.etag = f'"{self.last_modified:x}-{stat.st_size:x}"'
+        self.variants = [
+            (encoding, path + suffix)
+            for encoding, suffix in ENCODINGS
+            if os.path.isfile(path + suffix)
+        ]
+
+    def choose(self, request):
+        """(кодировка или None, путь) для Accept-Encoding клиента."""
+        if self.variants:
+            accepted = accepted_encodings(
+                request.META.get('HTTP_ACCEPT_ENCODING', '')
+            )
+            for encoding, path in self.variants:
+                if encoding in accepted:
+                    return encoding, path
+        return None, self.path
+
+    def response(self, request):
+        encoding, path = self.choose(request)
+        etag = self.etag
+        if encoding is not None:
+            etag = f'{etag[:-1]}-{encoding}"'
+        response = get_conditional_response(
+            request, etag=etag, last_modified=self.last_modified
+        )
+        if response is None:
+            if request.method == 'HEAD':
+                response = HttpResponse(content_type=self.content_type)
+                response['Content-Length'] = os.path.getsize(path)
+            else:
+                response = FileResponse(
+                    open(path, 'rb'), content_type=self.content_type
+                )
+            if encoding is not None:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(self.last_modified)
+        if self.variants:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        if self.immutable:
+            patch_cache_control(
+                response, public=True, max_age=IMMUTABLE_MAX_AGE,
+                immutable=True,
+            )
+        else:
+            patch_cache_control(
+                response, public=True, max_age=settings.STATIC_MAX_AGE
+            )
+        return response
+
+
+class StaticFilesMiddleware:
+    """Отдаёт собранную collectstatic статику до остальных middleware.
+
+    Список файлов STATIC_ROOT читается один раз при запуске, поэтому
+    на запрос не тратятся обращения к диску, а отдать можно только
+    собранные файлы. Клиенту, принимающему brotli или gzip, уходит
+    готовая сжатая копия; файлы с хешем из манифеста кешируются
+    навсегда (immutable). Включается SERVE_STATIC.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SERVE_STATIC or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = urlparse(settings.STATIC_URL).path
+        self.files = self.collect(settings.STATIC_ROOT)
+
+    def collect(self, root):
+        hashed = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        files = {}
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, root).replace(os.sep, '/')
+                if name.endswith(('.gz', '.br')) and os.path.isfile(path[:-3]):
+                    continue
+                files[name] = StaticFile(path, name in hashed)
+        return files
+
+    def __call__(self, request):
+        if (
+            request.method in ('GET', 'HEAD')
+            and request.path_info.startswith(self.prefix)
+        ):
+            static = self.files.get(request.path_info[len(self.prefix):])
+            if static is not None:
+                return static.response(request)
+        return self.get_response(request)
@@ -0,0 +1,124 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_current = ContextVar('replica_routing', default=None)
+
+# Сессии всегда читаются с основной базы: только что вошедший
+# пользователь не должен терять сессию из-за отставания реплики.
+PRIMARY_APPS = {'sessions'}
+
+
+class RequestRouting:
+    """Маршрутизация SQL одного запроса.
+
+    replica — реплика для чтения, None читает с основной базы.
+    После первой записи чтение до конца запроса тоже идёт
+    на основную базу, чтобы запрос видел свои изменения.
+    used_replica — было ли хоть одно чтение с реплики.
+    """
+
+    def __init__(self, replica=None):
+        self.replica = replica
+        self.wrote = False
+        self.used_replica = False
+
+    @property
+    def reads_replica(self):
+        return self.replica is not None and not self.wrote
+
+
+def activate(routing):
+    return _current.set(routing)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+def reads_replica():
+    """Читает ли текущий запрос с реплики."""
+    routing = _current.get()
+    return routing is not None and routing.reads_replica
+
+
+def used_replica():
+    """Читал ли текущий запрос что-нибудь с реплики."""
+    routing = _current.get()
+    return routing is not None and routing.used_replica
+
+
+@contextmanager
+def read_primary():
+    """Чтение внутри блока идёт с основной базы и во view с use_replica.
+
+    Нужно для данных, которые переживут запрос, например страниц
+    и лент в кеше: отставшая реплика закешировала бы старое состояние
+    под новой версией ленты.
+    """
+    routing = _current.get()
+    if routing is None:
+        yield
+        return
+    replica = routing.replica
+    routing.replica = None
+    try:
+        yield
+    finally:
+        routing.replica = replica
+
+
+def choose_replica():
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def use_replica(view):
+    """Помечает view только для чтения: GET-запросы можно читать с реплик."""
+    view.use_replica = True
+    return view
+
+
+class ReplicaRouter:
+    """Отправляет чтение помеченных use_replica view на реплики.
+
+    Реплику выбирает core.middleware.replicas.ReplicaMiddleware, вне
+    запроса и во всех остальных view работает только основная база.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = _current.get()
+        if routing is None:
+            return None
+        # Явный ответ: без него Django читает связанные объекты из базы,
+        # откуда загружен экземпляр-подсказка, то есть с реплики.
+        if not routing.reads_replica:
+            return DEFAULT_DB_ALIAS
+        if model._meta.app_label in PRIMARY_APPS:
+            return DEFAULT_DB_ALIAS
+        routing.used_replica = True
+        return routing.replica
+
+    def db_for_write(self, model, **hints):
+        routing = _current.get()
+        if routing is not None:
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Реплики получают схему вместе с данными с основной базы.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,52 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSED_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.json', '.xml', '.html',
+)
+
+# Сжатый вариант не сохраняется, если выигрыш меньше 5%.
+MIN_RATIO = 0.95
+
+
+def compress(content):
+    """[(суффикс, сжатые байты)] для доступных кодировок."""
+    variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(content, quality=11)))
+    return variants
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хранилище с хешами в именах файлов и сжатыми копиями рядом.
+
+    collectstatic кладёт рядом с текстовыми файлами .gz и, если
+    установлен пакет brotli, .br; их отдаёт
+    core.middleware.static.StaticFilesMiddleware.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = {*paths, *self.hashed_files.values()}
+        for name in sorted(names):
+            if name.endswith(COMPRESSED_EXTENSIONS):
+                self.compress_file(name)
+
+    def compress_file(self, name):
+        with self.open(name) as file:
+            content = file.read()
+        for suffix, data in compress(content):
+            compressed_name = name + suffix
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            if len(data) < len(content) * MIN_RATIO:
+                self._save(compressed_name, ContentFile(data))
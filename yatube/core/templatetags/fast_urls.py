@@ -0,0 +1,133 @@
+"""Быстрый {% url %} для часто выводимых маршрутов.
+
+Маршрут один раз разворачивается reverse() с пробными значениями
+параметров и превращается в шаблон строки; дальше URL собирается
+подстановкой, без обхода резолвера. Значение, которое не проходит
+конвертер маршрута, и маршруты, которые не удалось скомпилировать,
+разворачиваются обычным reverse() — результат всегда совпадает с ним.
+"""
+import re
+from urllib.parse import quote
+
+from django import template
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import (
+    NoReverseMatch, URLPattern, URLResolver, get_resolver, get_script_prefix,
+    get_urlconf, reverse
+)
+from django.urls.resolvers import RoutePattern
+from django.utils.http import RFC3986_SUBDELIMS, escape_leading_slashes
+
+register = template.Library()
+
+# Как в URLResolver._reverse_with_prefix().
+SAFE_CHARS = RFC3986_SUBDELIMS + '/~:@'
+
+_routes = {}
+
+
+class CompiledRoute:
+    def __init__(self, template_string, converters):
+        self.template = template_string
+        # [(имя параметра, конвертер, скомпилированное регулярное выражение)]
+        self.converters = converters
+        self.names = [name for name, _, _ in converters]
+
+    def build(self, args, kwargs):
+        """URL для параметров или None, если их должен проверить reverse()."""
+        if args and kwargs:
+            return None
+        if args:
+            if len(args) != len(self.names):
+                return None
+            kwargs = dict(zip(self.names, args))
+        elif set(kwargs) != set(self.names):
+            return None
+        parts = {}
+        for name, converter, regex in self.converters:
+            text = str(converter.to_url(kwargs[name]))
+            if not regex.fullmatch(text):
+                return None
+            parts[name] = quote(text, safe=SAFE_CHARS)
+        return escape_leading_slashes(self.template.format(**parts))
+
+
+def _find_route(patterns, namespaces, name, prefix=''):
+    """Полный route и конвертеры именованного маршрута или None."""
+    for pattern in patterns:
+        if not isinstance(pattern.pattern, RoutePattern):
+            continue
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace is None:
+                found = _find_route(
+                    pattern.url_patterns, namespaces, name, route
+                )
+            elif namespaces and pattern.namespace == namespaces[0]:
+                found = _find_route(
+                    pattern.url_patterns, namespaces[1:], name, route
+                )
+            else:
+                continue
+            if found is not None:
+                return found
+        elif (
+            isinstance(pattern, URLPattern)
+            and not namespaces
+            and pattern.name == name
+        ):
+            return RoutePattern(route, is_endpoint=True).converters
+    return None
+
+
+def compile_route(view_name):
+    """CompiledRoute для маршрута или None, если его не разобрать."""
+    *namespaces, name = view_name.split(':')
+    converters = _find_route(
+        get_resolver(get_urlconf()).url_patterns, namespaces, name
+    )
+    if converters is None:
+        return None
+    # Пробные значения из цифр подходят конвертерам int, slug, str и path.
+    samples = {
+        param: f'7{number:03d}1729' for number, param in enumerate(converters)
+    }
+    try:
+        url = reverse(view_name, kwargs=samples)
+    except NoReverseMatch:
+        return None
+    template_string = url.replace('{', '{{').replace('}', '}}')
+    for param, sample in samples.items():
+        if url.count(sample) != 1:
+            return None
+        template_string = template_string.replace(sample, f'{{{param}}}')
+    return CompiledRoute(template_string, [
+        (param, converter, re.compile(converter.regex))
+        for param, converter in converters.items()
+    ])
+
+
+def fast_reverse(view_name, *args, **kwargs):
+    """reverse(view_name, args=args, kwargs=kwargs) через шаблон маршрута."""
+    key = (get_urlconf(), get_script_prefix(), view_name)
+    try:
+        route = _routes[key]
+    except KeyError:
+        route = _routes[key] = compile_route(view_name)
+    url = route.build(args, kwargs) if route is not None else None
+    if url is None:
+        url = reverse(view_name, args=args or None, kwargs=kwargs or None)
+    return url
+
+
+@receiver(setting_changed)
+def clear_routes(setting, **kwargs):
+    if setting == 'ROOT_URLCONF':
+        _routes.clear()
+
+
+@register.simple_tag
+def fast_url(view_name, *args, **kwargs):
+    """{% fast_url 'posts:profile' username %} — замена {% url %}."""
+    return fast_reverse(view_name, *args, **kwargs)
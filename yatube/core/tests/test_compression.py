@@ -0,0 +1,91 @@
+import gzip
+import zlib
+from unittest import skipUnless
+
+from django.test import Client, SimpleTestCase, override_settings
+
+from core import metrics
+from core.middleware import compression
+from core.tests import urls
+from core.tests.urls import TEXT
+
+
+@override_settings(
+    ROOT_URLCONF='core.tests.urls', RESPONSE_COMPRESSION=True
+)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        metrics.compression_ratio.clear()
+        metrics.compression_cpu.clear()
+
+    def get(self, path, encoding='gzip, deflate'):
+        return Client().get(path, HTTP_ACCEPT_ENCODING=encoding)
+
+    def test_gzip(self):
+        response = self.get('/text/')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(response['ETag'], 'W/"text"')
+        self.assertEqual(
+            int(response['Content-Length']), len(response.content)
+        )
+        self.assertEqual(gzip.decompress(response.content).decode(), TEXT)
+
+    def test_not_accepted(self):
+        for encoding in ('', 'gzip;q=0', 'deflate'):
+            with self.subTest(encoding=encoding):
+                response = self.get('/text/', encoding)
+                self.assertFalse(response.has_header('Content-Encoding'))
+                self.assertIn('Accept-Encoding', response['Vary'])
+                self.assertEqual(response.content.decode(), TEXT)
+
+    def test_skipped_responses(self):
+        for path in ('/small/', '/encoded/', '/image/'):
+            with self.subTest(path=path):
+                response = self.get(path)
+                self.assertNotEqual(response.get('Content-Encoding'), 'gzip')
+                self.assertFalse(response.has_header('Vary'))
+
+    def test_streaming_is_compressed_by_chunks(self):
+        response = self.get('/stream/')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(
+            gzip.decompress(b''.join(chunks)).decode(), TEXT * 10
+        )
+
+    def test_stream_is_flushed_before_it_ends(self):
+        urls.rows_sent.clear()
+        decompressor = zlib.decompressobj(31)
+        text = ''
+        for data in self.get('/rows/').streaming_content:
+            text += decompressor.decompress(data).decode()
+            if text:
+                break
+        self.assertTrue(text.startswith('0,строка выгрузки\n'))
+        self.assertLess(len(urls.rows_sent), urls.ROWS)
+
+    def test_metrics(self):
+        self.get('/text/')
+        list(self.get('/stream/').streaming_content)
+        ratios = metrics.compression_ratio.snapshot()
+        for view in ('text', 'stream'):
+            series = ratios[(('encoding', 'gzip'), ('view', view))]
+            self.assertEqual(series['count'], 1)
+            self.assertLess(series['sum'], 0.1)
+        self.assertIn(
+            'yatube_compression_cpu_seconds_count'
+            '{encoding="gzip",view="text"} 1',
+            metrics.exposition(),
+        )
+
+    @skipUnless(compression.brotli, 'brotli не установлен')
+    def test_brotli_is_preferred(self):
+        response = self.get('/text/', 'gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(
+            compression.brotli.decompress(response.content).decode(), TEXT
+        )
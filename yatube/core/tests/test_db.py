@@ -0,0 +1,13 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from core.db import apply_sqlite_pragmas
+
+
+class SqlitePragmasTests(TestCase):
+    @override_settings(SQLITE_PRAGMAS={'busy_timeout': 1234})
+    def test_pragmas_are_applied(self):
+        apply_sqlite_pragmas(sender=None, connection=connection)
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 1234)
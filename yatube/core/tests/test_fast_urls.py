@@ -0,0 +1,72 @@
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+from django.urls import NoReverseMatch, reverse, set_script_prefix
+
+from core.templatetags.fast_urls import compile_route, fast_reverse
+
+
+class FastReverseTests(SimpleTestCase):
+    routes = {
+        'posts:index': [()],
+        'posts:post_create': [()],
+        'about:author': [()],
+        'users:login': [()],
+        'posts:profile': [
+            ('Name',), ('user.name+tag@mail',), ('Имя',), ('a b%c',),
+        ],
+        'posts:post_detail': [(1,), (12345,), ('7',)],
+        'posts:post_edit': [(1,)],
+        'posts:group_list': [('group',), ('some-slug_1',)],
+    }
+
+    def tearDown(self):
+        set_script_prefix('/')
+
+    def test_same_as_reverse(self):
+        for prefix in ('/', '/yatube/'):
+            set_script_prefix(prefix)
+            for name, calls in self.routes.items():
+                for args in calls:
+                    with self.subTest(prefix=prefix, name=name, args=args):
+                        self.assertEqual(
+                            fast_reverse(name, *args), reverse(name, args=args)
+                        )
+
+    def test_keyword_arguments(self):
+        self.assertEqual(
+            fast_reverse('posts:post_edit', post_id=3),
+            reverse('posts:post_edit', kwargs={'post_id': 3}),
+        )
+
+    def test_hot_routes_are_compiled(self):
+        for name in self.routes:
+            with self.subTest(name=name):
+                self.assertIsNotNone(compile_route(name))
+
+    def test_invalid_values_raise_like_reverse(self):
+        calls = [
+            ('posts:post_detail', ('abc',)),
+            ('posts:group_list', ('не slug',)),
+            ('posts:profile', ('a/b',)),
+            ('posts:profile', ()),
+            ('posts:missing', ()),
+        ]
+        for name, args in calls:
+            with self.subTest(name=name, args=args):
+                with self.assertRaises(NoReverseMatch):
+                    fast_reverse(name, *args)
+
+    def test_urlconf_change_drops_compiled_routes(self):
+        fast_reverse('posts:index')
+        with override_settings(ROOT_URLCONF='core.tests.urls'):
+            self.assertEqual(fast_reverse('n_plus_one'), '/n-plus-one/')
+            with self.assertRaises(NoReverseMatch):
+                fast_reverse('posts:index')
+
+    def test_template_tag(self):
+        rendered = Template(
+            "{% load fast_urls %}{% fast_url 'posts:profile' name %}"
+        ).render(Context({'name': '<Name>'}))
+        self.assertEqual(
+            rendered, reverse('posts:profile', args=['<Name>'])
+        )
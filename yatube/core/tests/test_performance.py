@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.template.loader import render_to_string
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core import instrumentation, metrics
+from posts.models import Post
+
+User = get_user_model()
+
+
+class PerformanceMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.staff = User.objects.create_user(username='Staff', is_staff=True)
+        cls.user = User.objects.create_user(username='Name')
+
+    def setUp(self):
+        self.guest_client = Client()
+        for metric in metrics.REGISTRY:
+            metric.clear()
+
+    def test_server_timing_header(self):
+        response = self.guest_client.get(reverse('posts:index'))
+        timing = response['Server-Timing']
+        self.assertIn('app;dur=', timing)
+        self.assertIn('SQL"', timing)
+        tpl = float(timing.split('tpl;dur=')[1])
+        self.assertGreater(tpl, 0)
+
+    def test_views_are_aggregated_by_name(self):
+        for _ in range(3):
+            self.guest_client.get(reverse('posts:index'))
+        series = metrics.request_duration.snapshot()
+        self.assertEqual(series[(('view', 'posts:index'),)]['count'], 3)
+        queries = metrics.db_queries.snapshot()[(('view', 'posts:index'),)]
+        self.assertGreater(queries['sum'], 0)
+
+    def test_metrics_endpoint_for_staff_only(self):
+        self.guest_client.get(reverse('posts:index'))
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(reverse('core:metrics'))
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        client.force_login(self.staff)
+        response = client.get(reverse('core:metrics'))
+        self.assertContains(
+            response,
+            'yatube_request_duration_seconds_count{view="posts:index"} 1',
+        )
+        self.assertContains(response, '# TYPE yatube_db_queries histogram')
+
+
+@override_settings(TEMPLATE_PROFILING=True)
+class TemplateProfilingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f'Пост {i}') for i in range(5)
+        )
+
+    def test_includes_are_profiled(self):
+        with self.assertLogs('core.templates', 'INFO') as logs:
+            response = Client().get(reverse('posts:index'))
+        timing = response['Server-Timing']
+        self.assertIn('desc="posts/index.html x1"', timing)
+        self.assertIn('desc="includes/post_card.html x5"', timing)
+        self.assertIn('desc="includes/post.html x10"', timing)
+        self.assertIn('includes/post_text.html', logs.output[0])
+
+    def test_own_time_excludes_includes(self):
+        stats = instrumentation.RequestStats(profile_templates=True)
+        token = instrumentation.activate(stats)
+        try:
+            render_to_string(
+                'posts/index.html', {'page_obj': Post.objects.all()}
+            )
+        finally:
+            instrumentation.deactivate(token)
+        profile = dict(stats.template_profile())
+        index = profile['posts/index.html']
+        self.assertLess(index['own'], index['total'])
+        own_sum = sum(data['own'] for data in profile.values())
+        self.assertAlmostEqual(own_sum, stats.template_time, places=3)
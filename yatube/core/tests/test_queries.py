@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.middleware.queries import fingerprint
+from posts.models import Post
+
+User = get_user_model()
+
+
+class FingerprintTests(TestCase):
+    def test_values_are_normalized(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE a = 1 AND b = 'x''y'"),
+            fingerprint("SELECT *  FROM t\nWHERE a = 25 AND b = 'z'"),
+        )
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            'SELECT * FROM t WHERE id IN (...)',
+        )
+
+
+@override_settings(QUERY_INSPECTOR_SAMPLE_RATE=1)
+class QueryInspectorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        for i in range(3):
+            author = User.objects.create_user(username=f'author{i}')
+            Post.objects.create(author=author, text=f'Пост {i}')
+
+    def test_clean_page_is_not_reported(self):
+        response = Client().get(reverse('posts:index'))
+        self.assertEqual(response.wsgi_request.query_problems, [])
+
+    def test_duplicate_queries_are_reported(self):
+        # Без select_related автор каждого поста грузится отдельно.
+        with override_settings(ROOT_URLCONF='core.tests.urls'):
+            with self.assertLogs('core.queries', 'WARNING') as logs:
+                Client().get('/n-plus-one/')
+        self.assertIn('3 раз: SELECT', logs.output[0])
+
+    @override_settings(QUERY_INSPECTOR_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_reported(self):
+        with self.assertLogs('core.queries', 'WARNING') as logs:
+            Client().get(reverse('posts:index'))
+        self.assertIn('запросов за', logs.output[0])
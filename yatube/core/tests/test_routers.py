@@ -0,0 +1,145 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import connections
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.middleware.replicas import PIN_COOKIE
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(TestCase):
+    databases = {'default', 'replica'}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Реплика — второе соединение к той же базе в памяти, без этого
+        # оно ждёт блокировок незакоммиченной транзакции теста.
+        with connections['replica'].cursor() as cursor:
+            cursor.execute('PRAGMA read_uncommitted = 1')
+        cls.user = User.objects.create_user(username='Name')
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый текст поста',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connections['default']) as primary:
+            with CaptureQueriesContext(connections['replica']) as replica:
+                response = client.get(url)
+        return response, len(primary), len(replica)
+
+    def test_read_only_views_use_replica(self):
+        urls = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                # Первый запрос к ленте может заполнить её счётчик.
+                Client().get(url)
+                response, primary, replica = self.get(self.guest_client, url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(primary, 0)
+                self.assertGreater(replica, 0)
+
+    def test_sessions_are_read_from_primary(self):
+        response, primary, replica = self.get(
+            self.authorized_client,
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+        )
+        self.assertEqual(response.context['user'], self.user)
+        self.assertEqual(primary, 1)
+        self.assertGreater(replica, 0)
+
+    def test_forms_use_primary(self):
+        response, primary, replica = self.get(
+            self.authorized_client, reverse('posts:post_create')
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(replica, 0)
+
+    def test_author_reads_own_writes_after_post(self):
+        response = self.authorized_client.post(
+            reverse('posts:post_create'), data={'text': 'Свежий пост'}
+        )
+        self.assertIn(PIN_COOKIE, response.cookies)
+        response, primary, replica = self.get(
+            self.authorized_client, reverse('posts:index')
+        )
+        self.assertContains(response, 'Свежий пост')
+        self.assertEqual(replica, 0)
+
+    def test_pin_expires(self):
+        self.authorized_client.post(
+            reverse('posts:post_create'), data={'text': 'Свежий пост'}
+        )
+        del self.authorized_client.cookies[PIN_COOKIE]
+        _, _, replica = self.get(
+            self.authorized_client,
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+        )
+        self.assertGreater(replica, 0)
+
+    def test_search_uses_replica(self):
+        response, primary, replica = self.get(
+            self.guest_client, reverse('posts:search') + '?q=Тестовый'
+        )
+        self.assertContains(response, 'Тестовый текст поста')
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_cached_page_is_built_from_primary(self):
+        url = reverse('posts:index')
+        Client().get(url)
+        cache.clear()
+        with override_settings(POSTS_PAGE_CACHE=True):
+            _, primary, replica = self.get(self.guest_client, url)
+            self.assertGreater(primary, 0)
+            self.assertEqual(replica, 0)
+            _, primary, replica = self.get(self.guest_client, url)
+        self.assertEqual((primary, replica), (0, 0))
+
+    @override_settings(POSTS_TIMELINES=True)
+    def test_timeline_is_built_from_primary(self):
+        url = reverse('posts:group_list', kwargs={'slug': self.group.slug})
+        caches['timelines'].clear()
+        Client().get(url)
+        caches['timelines'].clear()
+        with CaptureQueriesContext(connections['default']) as primary:
+            self.guest_client.get(url)
+        self.assertTrue(any(
+            'ORDER BY' in query['sql'] for query in primary.captured_queries
+        ))
+        _, primary, replica = self.get(self.guest_client, url)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    @override_settings(POSTS_CONDITIONAL_GET=True)
+    def test_replica_pages_get_no_feed_validators(self):
+        url = reverse('posts:index')
+        Client().get(url)
+        cache.clear()
+        response = self.guest_client.get(url)
+        self.assertFalse(response.has_header('ETag'))
+        with override_settings(POSTS_PAGE_CACHE=True):
+            response = self.guest_client.get(url)
+        self.assertTrue(response.has_header('ETag'))
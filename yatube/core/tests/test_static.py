@@ -0,0 +1,95 @@
+import gzip
+import shutil
+import tempfile
+from unittest import skipUnless
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core import storage
+
+CSS = 'css/bootstrap.min.css'
+
+
+class StaticFilesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.settings = override_settings(
+            STATIC_ROOT=cls.static_root,
+            STATICFILES_FINDERS=[
+                'django.contrib.staticfiles.finders.FileSystemFinder',
+            ],
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'
+            ),
+            SERVE_STATIC=True,
+        )
+        cls.settings.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.hashed_css = staticfiles_storage.stored_name(CSS)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        shutil.rmtree(cls.static_root)
+        super().tearDownClass()
+
+    def get(self, name, **headers):
+        return Client().get(f'/static/{name}', **headers)
+
+    def test_text_files_get_compressed_copies(self):
+        self.assertNotEqual(self.hashed_css, CSS)
+        self.assertTrue(staticfiles_storage.exists(self.hashed_css + '.gz'))
+        self.assertTrue(staticfiles_storage.exists(CSS + '.gz'))
+        self.assertFalse(staticfiles_storage.exists('img/logo.png.gz'))
+
+    def test_hashed_file_is_served_compressed_and_immutable(self):
+        response = self.get(self.hashed_css, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        with staticfiles_storage.open(CSS) as file:
+            self.assertEqual(
+                gzip.decompress(b''.join(response.streaming_content)),
+                file.read(),
+            )
+
+    @skipUnless(storage.brotli, 'brotli не установлен')
+    def test_brotli_is_preferred(self):
+        response = self.get(
+            self.hashed_css, HTTP_ACCEPT_ENCODING='gzip, deflate, br'
+        )
+        self.assertEqual(response['Content-Encoding'], 'br')
+
+    def test_plain_copy_without_accept_encoding(self):
+        response = self.get(self.hashed_css)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Content-Type'], 'text/css')
+        gzip_response = self.get(
+            self.hashed_css, HTTP_ACCEPT_ENCODING='gzip;q=0'
+        )
+        self.assertFalse(gzip_response.has_header('Content-Encoding'))
+        self.assertNotEqual(response['ETag'], self.get(
+            self.hashed_css, HTTP_ACCEPT_ENCODING='gzip'
+        )['ETag'])
+
+    def test_unhashed_file_is_cached_briefly(self):
+        response = self.get('img/logo.png')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_not_modified(self):
+        etag = self.get(self.hashed_css)['ETag']
+        response = self.get(self.hashed_css, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_unknown_path_falls_through(self):
+        self.assertEqual(self.get('css/missing.css').status_code, 404)
+
+    def test_templates_link_hashed_names(self):
+        response = Client().get(reverse('posts:index'))
+        self.assertContains(response, self.hashed_css)
@@ -0,0 +1,63 @@
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import path
+
+from posts.models import Post
+
+TEXT = 'Строка для сжатия.\n' * 200
+
+ROWS = 1000
+
+# Сколько строк отдал view rows, чтобы проверять, когда приходят байты.
+rows_sent = []
+
+
+def n_plus_one(request):
+    names = [post.author.username for post in Post.objects.all()]
+    return HttpResponse(', '.join(names))
+
+
+def text(request):
+    response = HttpResponse(TEXT, content_type='text/plain; charset=utf-8')
+    response['ETag'] = '"text"'
+    return response
+
+
+def small(request):
+    return HttpResponse('коротко', content_type='text/plain; charset=utf-8')
+
+
+def stream(request):
+    return StreamingHttpResponse(
+        (TEXT for _ in range(10)), content_type='text/csv; charset=utf-8'
+    )
+
+
+def rows(request):
+    def generate():
+        for number in range(ROWS):
+            rows_sent.append(number)
+            yield f'{number},строка выгрузки\n'
+    return StreamingHttpResponse(
+        generate(), content_type='text/csv; charset=utf-8'
+    )
+
+
+def encoded(request):
+    response = HttpResponse(TEXT, content_type='text/plain; charset=utf-8')
+    response['Content-Encoding'] = 'identity'
+    return response
+
+
+def image(request):
+    return HttpResponse(TEXT, content_type='image/png')
+
+
+urlpatterns = [
+    path('n-plus-one/', n_plus_one, name='n_plus_one'),
+    path('text/', text, name='text'),
+    path('small/', small, name='small'),
+    path('stream/', stream, name='stream'),
+    path('rows/', rows, name='rows'),
+    path('encoded/', encoded, name='encoded'),
+    path('image/', image, name='image'),
+]
@@ -0,0 +1,12 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
+
+from . import metrics
+
+
+@staff_member_required
+def metrics_view(request):
+    return HttpResponse(
+        metrics.exposition(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -0,0 +1,144 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+from django.http import HttpResponse
+
+from core.routers import read_primary
+
+INDEX_FEED = 'index'
+
+# Алиас, который тег {% cache %} использует по умолчанию.
+FRAGMENTS_CACHE = 'template_fragments'
+
+
+def index_feed():
+    return INDEX_FEED
+
+
+def group_feed(slug):
+    return f'group:{slug}'
+
+
+def author_feed(username):
+    return f'author:{username}'
+
+
+def _version_key(feed):
+    return f'posts:feed-version:{feed}'
+
+
+def get_feed_version(feed):
+    key = _version_key(feed)
+    version = cache.get(key)
+    if version is None:
+        # Версия от времени, а не с единицы: если ключ версии вытеснили
+        # из кеша, старые страницы не должны снова стать актуальными.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _modified_key(feed):
+    return f'posts:feed-modified:{feed}'
+
+
+def get_feed_modified(feed):
+    """Время последнего изменения ленты (Unix time) для Last-Modified."""
+    key = _modified_key(feed)
+    modified = cache.get(key)
+    if modified is None:
+        cache.add(key, int(time.time()), timeout=None)
+        modified = cache.get(key)
+    return modified
+
+
+def bump_feed_versions(feeds):
+    modified = int(time.time())
+    for feed in feeds:
+        try:
+            cache.incr(_version_key(feed))
+        except ValueError:
+            cache.set(_version_key(feed), time.time_ns(), timeout=None)
+        cache.set(_modified_key(feed), modified, timeout=None)
+
+
+def invalidate_feeds(feeds):
+    """Сбрасывает закешированные страницы лент."""
+    feeds = set(feeds)
+    bump_feed_versions(feeds)
+    # Между сбросом и коммитом страницу могли закешировать по старым
+    # данным, поэтому после коммита версии поднимаются ещё раз.
+    transaction.on_commit(lambda: bump_feed_versions(feeds))
+
+
+def post_feeds(post):
+    """Ключи лент, на страницах которых показывается пост."""
+    feeds = [INDEX_FEED, author_feed(post.author.get_username())]
+    if post.group_id is not None:
+        feeds.append(group_feed(post.group.slug))
+    return feeds
+
+
+def page_cache_key(feed, request):
+    # Для гостя шапка одинакова, поэтому состояние авторизации в ключе
+    # сводится к метке anon: авторизованным страницы из кеша не отдаются.
+    digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'posts:page:{feed}:{get_feed_version(feed)}:anon:{digest}'
+
+
+def cache_feed_page(get_feed):
+    """Кеширует отрендеренную страницу ленты для гостей.
+
+    get_feed получает аргументы view и возвращает ключ ленты;
+    кеш страниц ленты сбрасывается сигналами при изменении её постов.
+    Страница для кеша рендерится по основной базе: отставшая реплика
+    сохранила бы старые посты под новой версией ленты.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                not settings.POSTS_PAGE_CACHE
+                or request.method != 'GET'
+                or request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+            key = page_cache_key(get_feed(*args, **kwargs), request)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+            with read_primary():
+                response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(
+                    key,
+                    (response.content, response['Content-Type']),
+                    settings.POSTS_PAGE_CACHE_TIMEOUT,
+                )
+            return response
+        return wrapper
+    return decorator
+
+
+def post_fragment_keys(post):
+    """Ключи фрагментов includes/post_text.html и includes/post_card.html."""
+    return [
+        make_template_fragment_key('post_text', [post.pk, post.version]),
+    ] + [
+        make_template_fragment_key(
+            'post_card', [post.pk, post.version, show_author]
+        )
+        for show_author in (True, False)
+    ]
+
+
+def drop_post_fragments(post):
+    # Изменённый пост получает новую версию, а удалённый нужно убрать
+    # явно: SQLite может выдать его id следующему посту.
+    caches[FRAGMENTS_CACHE].delete_many(post_fragment_keys(post))
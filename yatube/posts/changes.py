@@ -0,0 +1,125 @@
+"""Изменённые посты после водяного знака для инкрементальной синхронизации.
+
+Посты отдаются в порядке (updated_at, id) keyset-выборкой по индексу
+post_updated_at_idx, токен next из ответа — водяной знак следующего
+запроса. Удаления берутся из журнала DeletedPost и идут в том же
+порядке по (deleted_at, id поста) записями с deleted: true.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .export import parse_moment
+from .models import DeletedPost, Post
+from .paginators import InvalidCursor, decode_cursor, encode_position
+
+DEFAULT_LIMIT = 100
+
+MAX_LIMIT = 1000
+
+
+def parse_since(value):
+    """Водяной знак: токен next или дата, ValueError при ошибке."""
+    if not value:
+        return None
+    try:
+        return decode_cursor(value)
+    except InvalidCursor:
+        return parse_moment(value), 0
+
+
+def parse_limit(value):
+    if not value:
+        return DEFAULT_LIMIT
+    limit = int(value)
+    if limit < 1:
+        raise ValueError(f'Некорректный limit: {value!r}')
+    return min(limit, MAX_LIMIT)
+
+
+def after(queryset, time_field, id_field, since):
+    """Строки queryset после водяного знака (время, id).
+
+    Граница time_field__gte даёт диапазон индекса (время, id), и строки
+    приходят уже по порядку: по одному условию OR SQLite сортирует все
+    строки после знака на каждой странице.
+    """
+    if since is None:
+        return queryset
+    moment, pk = since
+    return queryset.filter(
+        Q(**{f'{time_field}__gt': moment})
+        | Q(**{time_field: moment, f'{id_field}__gt': pk}),
+        **{f'{time_field}__gte': moment},
+    )
+
+
+def post_changes(since, settled, limit):
+    posts = after(
+        Post.objects.filter(updated_at__lte=settled), 'updated_at', 'pk',
+        since,
+    )
+    rows = posts.order_by('updated_at', 'pk').values_list(
+        'pk', 'text', 'author__username', 'group__slug', 'pub_date',
+        'updated_at', 'version',
+    )[:limit]
+    return [
+        (updated_at, pk, {
+            'id': pk,
+            'deleted': False,
+            'text': text,
+            'author': username,
+            'group': slug,
+            'pub_date': pub_date.isoformat(),
+            'updated_at': updated_at.isoformat(),
+            'version': version,
+        })
+        for pk, text, username, slug, pub_date, updated_at, version in rows
+    ]
+
+
+def deletions(since, settled, limit):
+    deleted = after(
+        DeletedPost.objects.filter(deleted_at__lte=settled),
+        'deleted_at', 'post_id', since,
+    )
+    rows = deleted.order_by('deleted_at', 'post_id').values_list(
+        'post_id', 'deleted_at'
+    )[:limit]
+    return [
+        (deleted_at, pk, {
+            'id': pk,
+            'deleted': True,
+            'updated_at': deleted_at.isoformat(),
+        })
+        for pk, deleted_at in rows
+    ]
+
+
+def changed_posts(since=None, limit=DEFAULT_LIMIT):
+    """Изменения после since, водяной знак и есть ли продолжение.
+
+    Самые свежие изменения придерживаются на POSTS_CHANGES_SETTLE_SECONDS:
+    транзакция, начатая раньше, может закоммитить пост с меньшим
+    updated_at уже после того, как клиент сдвинул водяной знак.
+    """
+    settled = timezone.now() - timedelta(
+        seconds=settings.POSTS_CHANGES_SETTLE_SECONDS
+    )
+    # Правки и удаления сливаются в один поток по (время, id).
+    entries = sorted(
+        post_changes(since, settled, limit + 1)
+        + deletions(since, settled, limit + 1),
+        key=lambda entry: entry[:2],
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if entries:
+        next_token = encode_position(*entries[-1][:2])
+    elif since is not None:
+        next_token = encode_position(*since)
+    else:
+        next_token = None
+    return [change for _, _, change in entries], next_token, has_more
@@ -0,0 +1,40 @@
+"""Проверки настроек posts для manage.py check."""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Бэкенды, у которых каждый процесс видит только своё содержимое.
+PROCESS_LOCAL_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def shared_cache_settings():
+    """Пары (настройка, алиас кеша), которым нужен общий для процессов кеш.
+
+    Сигналы сбрасывают состояние в кеше только в процессе, обработавшем
+    запись, остальные воркеры с кешем в памяти его не видят.
+    """
+    return [
+        ('POSTS_PAGE_CACHE', 'default'),
+        ('POSTS_CONDITIONAL_GET', 'default'),
+        ('POSTS_TIMELINES', settings.POSTS_TIMELINE_CACHE),
+    ]
+
+
+@register()
+def check_shared_caches(app_configs, **kwargs):
+    warnings = []
+    for name, alias in shared_cache_settings():
+        backend = settings.CACHES.get(alias, {}).get('BACKEND')
+        if getattr(settings, name) and backend in PROCESS_LOCAL_BACKENDS:
+            warnings.append(Warning(
+                f'{name} включён, а кеш {alias!r} живёт в памяти процесса.',
+                hint=(
+                    'Сброс после записи увидит только процесс, обработавший '
+                    'запрос. Укажите общий кеш (memcached) или выключите '
+                    f'{name}.'
+                ),
+                id='posts.W001',
+            ))
+    return warnings
@@ -0,0 +1,92 @@
+"""Условные GET-запросы: ETag, Last-Modified и Cache-Control.
+
+Валидаторы считаются до рендеринга: для лент — по версии ленты
+в кеше (posts.cache), для поста — по его версии. Клиент с актуальной
+копией получает 304 без рендеринга страницы.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_vary_headers
+)
+from django.utils.http import http_date, quote_etag
+
+from core import routers
+
+from .cache import get_feed_modified, get_feed_version
+
+
+def enabled(request):
+    return (
+        settings.POSTS_CONDITIONAL_GET
+        and request.method in ('GET', 'HEAD')
+    )
+
+
+def user_key(request):
+    # Шапка страницы зависит от пользователя, поэтому он входит в ETag.
+    if request.user.is_authenticated:
+        return request.user.pk
+    return 'anon'
+
+
+def make_etag(*parts):
+    value = ':'.join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(value.encode()).hexdigest())
+
+
+def not_modified(request, etag, last_modified=None):
+    """Ответ 304 (или 412), если копия клиента актуальна, иначе None."""
+    if request.user.is_authenticated:
+        # Last-Modified не различает пользователей, сверяем только ETag.
+        last_modified = None
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is not None:
+        add_validators(request, response, etag, last_modified)
+    return response
+
+
+def add_validators(request, response, etag, last_modified=None):
+    """Ставит валидаторы и Cache-Control для гостя или пользователя."""
+    response['ETag'] = etag
+    if request.user.is_authenticated:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(
+            response, public=True, max_age=settings.POSTS_HTTP_MAX_AGE
+        )
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+def conditional_feed(get_feed):
+    """Отвечает 304 на условный GET ленты, не вызывая view.
+
+    get_feed получает аргументы view и возвращает ключ ленты,
+    как в posts.cache.cache_feed_page.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not enabled(request):
+                return view(request, *args, **kwargs)
+            feed = get_feed(*args, **kwargs)
+            etag = make_etag(feed, get_feed_version(feed), user_key(request))
+            last_modified = get_feed_modified(feed)
+            response = not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200 or routers.used_replica():
+                # Страница с отставшей реплики не должна получить
+                # валидаторы новой версии ленты.
+                return response
+            return add_validators(request, response, etag, last_modified)
+        return wrapper
+    return decorator
@@ -0,0 +1,127 @@
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
+
+from .models import AuthorStats, FeedCounter, Group, Post, User
+
+INDEX_FEED = 'index'
+
+
+def get_count(key, queryset):
+    """Возвращает размер ленты из счётчика.
+
+    Если счётчика ещё нет, он один раз заполняется через COUNT(*),
+    дальше его поддерживают сигналы.
+    """
+    value = (
+        FeedCounter.objects.filter(key=key).
+        values_list('value', flat=True).first()
+    )
+    if value is not None:
+        return value
+    value = queryset.count()
+    try:
+        with transaction.atomic():
+            FeedCounter.objects.create(key=key, value=value)
+    except IntegrityError:
+        pass
+    return value
+
+
+def change_feed_count(key, delta):
+    # Несуществующий счётчик не трогаем: он будет посчитан
+    # целиком при первом чтении.
+    FeedCounter.objects.filter(key=key).update(value=F('value') + delta)
+
+
+def _change_posts_count(queryset, delta):
+    # Счётчик не уходит в минус, даже если успел разойтись с таблицей.
+    if delta < 0:
+        queryset = queryset.filter(posts_count__gte=-delta)
+    return queryset.update(posts_count=F('posts_count') + delta)
+
+
+def change_group_count(group_id, delta):
+    if group_id is None:
+        return
+    _change_posts_count(Group.objects.filter(pk=group_id), delta)
+
+
+def change_author_count(author_id, delta):
+    updated = _change_posts_count(
+        AuthorStats.objects.filter(author_id=author_id), delta
+    )
+    if not updated and delta > 0:
+        AuthorStats.objects.get_or_create(
+            author_id=author_id,
+            defaults={
+                'posts_count': Post.objects.filter(author_id=author_id).count()
+            },
+        )
+
+
+def author_stats(author):
+    """AuthorStats автора, недостающая строка создаётся по COUNT(*).
+
+    Строки нет у пользователей из loaddata (raw-сигнал её не создаёт)
+    и из bulk_create.
+    """
+    try:
+        return author.post_stats
+    except AuthorStats.DoesNotExist:
+        stats, _ = AuthorStats.objects.get_or_create(
+            author=author,
+            defaults={
+                'posts_count': Post.objects.filter(author=author).count()
+            },
+        )
+        author.post_stats = stats
+        return stats
+
+
+def change_post_counts(post, delta):
+    change_feed_count(INDEX_FEED, delta)
+    change_author_count(post.author_id, delta)
+    change_group_count(post.group_id, delta)
+
+
+def rebuild_counts():
+    """Пересчитывает все счётчики постов с нуля."""
+    posts_by_group = (
+        Post.objects.filter(group=OuterRef('pk')).
+        order_by().values('group').annotate(total=Count('pk')).
+        values('total')
+    )
+    with transaction.atomic():
+        Group.objects.update(
+            posts_count=Coalesce(Subquery(posts_by_group), 0)
+        )
+        AuthorStats.objects.all().delete()
+        AuthorStats.objects.bulk_create(
+            AuthorStats(author_id=user_id, posts_count=total)
+            for user_id, total in User.objects.annotate(
+                total=Count('posts')
+            ).values_list('pk', 'total').iterator()
+        )
+        FeedCounter.objects.update_or_create(
+            key=INDEX_FEED, defaults={'value': Post.objects.count()}
+        )
+
+
+class CountedPaginator(Paginator):
+    """Paginator с заранее известным числом объектов.
+
+    count — число или функция без аргументов, которая его возвращает.
+    """
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._count = count
+
+    @cached_property
+    def count(self):
+        if callable(self._count):
+            return self._count()
+        return self._count
@@ -0,0 +1,80 @@
+import csv
+import json
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Post
+
+EXPORT_FIELDS = ('id', 'text', 'author', 'group', 'pub_date')
+FORMATS = {
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+CHUNK_SIZE = 2000
+
+
+def parse_moment(value, end_of_day=False):
+    """Разбирает дату или дату со временем для фильтров выгрузки."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Некорректная дата: {value!r}')
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, timezone.utc)
+    return moment
+
+
+def export_rows(author=None, group=None, since=None, until=None):
+    """Посты словарями, по частям с сервера и в порядке id.
+
+    Формат записей совпадает с тем, что принимает import_posts.
+    """
+    posts = Post.objects.order_by('pk')
+    if author:
+        posts = posts.filter(author__username=author)
+    if group:
+        posts = posts.filter(group__slug=group)
+    if since:
+        posts = posts.filter(pub_date__gte=parse_moment(since))
+    if until:
+        posts = posts.filter(pub_date__lte=parse_moment(until, True))
+    rows = posts.values_list(
+        'pk', 'text', 'author__username', 'group__slug', 'pub_date'
+    ).iterator(chunk_size=CHUNK_SIZE)
+    for pk, text, username, slug, pub_date in rows:
+        yield {
+            'id': pk,
+            'text': text,
+            'author': username,
+            'group': slug,
+            'pub_date': pub_date.isoformat(),
+        }
+
+
+class EchoBuffer:
+    """Файлоподобный объект для csv.writer, возвращающий записанное."""
+
+    def write(self, value):
+        return value
+
+
+def render_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def render_csv(rows):
+    writer = csv.DictWriter(EchoBuffer(), fieldnames=EXPORT_FIELDS)
+    yield writer.writerow(dict(zip(EXPORT_FIELDS, EXPORT_FIELDS)))
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def render(rows, export_format):
+    if export_format == 'csv':
+        return render_csv(rows)
+    return render_jsonl(rows)
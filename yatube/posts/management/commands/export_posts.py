@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.export import FORMATS, export_rows, parse_moment, render
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты в JSONL или CSV, не загружая таблицу в память.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=tuple(FORMATS), default='jsonl'
+        )
+        parser.add_argument('--output', '-o', default='-')
+        parser.add_argument('--author', help='username автора.')
+        parser.add_argument('--group', help='slug группы.')
+        parser.add_argument('--since', help='Дата или дата и время.')
+        parser.add_argument('--until', help='Дата или дата и время.')
+
+    def handle(self, *args, **options):
+        for name in ('since', 'until'):
+            if options[name]:
+                try:
+                    parse_moment(options[name])
+                except ValueError as error:
+                    raise CommandError(error)
+        rows = export_rows(
+            author=options['author'],
+            group=options['group'],
+            since=options['since'],
+            until=options['until'],
+        )
+        chunks = render(rows, options['format'])
+        if options['output'] == '-':
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(
+            options['output'], 'w', encoding='utf-8', newline=''
+        ) as output:
+            output.writelines(chunks)
@@ -0,0 +1,215 @@
+import csv
+import json
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts import cache, counters, timelines
+from posts.models import Group, Post, User
+
+FORMATS = ('jsonl', 'csv')
+
+
+@contextmanager
+def keep_pub_date():
+    """Отключает auto_now_add у pub_date, чтобы сохранить даты источника.
+
+    bulk_create иначе перезапишет pub_date текущим временем.
+    """
+    field = Post._meta.get_field('pub_date')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        'Импортирует посты из JSONL или CSV пачками через bulk_create. '
+        'Поля записи: text, author (username), group (slug, необязательно), '
+        'pub_date (ISO 8601, необязательно).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл с постами, - для stdin.')
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--create-authors',
+            action='store_true',
+            help='Создавать отсутствующих авторов без пароля.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        data_format = options['format'] or path.rsplit('.', 1)[-1]
+        if data_format not in FORMATS:
+            raise CommandError(
+                f'Не удалось определить формат {path}, укажите --format.'
+            )
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        self.batch_size = options['batch_size']
+        self.create_authors = options['create_authors']
+        self.authors = dict(User.objects.values_list('username', 'pk'))
+        self.groups = dict(Group.objects.values_list('slug', 'pk'))
+        self.imported = 0
+        self.skipped = 0
+        self.feeds = set()
+        self.timelines = set()
+        self.started = time.monotonic()
+
+        if path == '-':
+            self.import_file(sys.stdin, data_format)
+        else:
+            with open(path, encoding='utf-8', newline='') as file:
+                self.import_file(file, data_format)
+
+        cache.invalidate_feeds(self.feeds)
+        # bulk_create не шлёт сигналов, ленты соберутся из базы заново.
+        timelines.drop(self.timelines)
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортировано постов: {self.imported}, '
+            f'пропущено: {self.skipped}, {self.rate():.0f} строк/с.'
+        ))
+
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return self.imported / elapsed if elapsed else 0
+
+    def read_records(self, file, data_format):
+        if data_format == 'csv':
+            yield from enumerate(csv.DictReader(file), start=2)
+            return
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as error:
+                self.skip(line_number, f'некорректный JSON: {error}')
+
+    def import_file(self, file, data_format):
+        batch = []
+        for line_number, record in self.read_records(file, data_format):
+            post = self.build_post(line_number, record)
+            if post is None:
+                continue
+            batch.append(post)
+            if len(batch) >= self.batch_size:
+                self.write_batch(batch)
+                batch = []
+        if batch:
+            self.write_batch(batch)
+
+    def skip(self, line_number, reason):
+        self.skipped += 1
+        self.stderr.write(f'Строка {line_number} пропущена: {reason}')
+
+    def author_id(self, username):
+        """id автора; None — автора нет или имя не годится для нового."""
+        if username in self.authors or not self.create_authors:
+            return self.authors.get(username)
+        try:
+            # Валидаторы поля: допустимые символы и max_length.
+            User._meta.get_field('username').run_validators(username)
+        except ValidationError:
+            return None
+        user = User(username=username)
+        user.set_unusable_password()
+        user.save()
+        self.authors[username] = user.pk
+        return user.pk
+
+    def build_post(self, line_number, record):
+        if not isinstance(record, dict):
+            self.skip(line_number, 'запись не объект')
+            return None
+        not_string = self.first_not_string(record)
+        if not_string is not None:
+            self.skip(line_number, f'{not_string} не строка')
+            return None
+        text = (record.get('text') or '').strip()
+        if not text:
+            self.skip(line_number, 'пустой text')
+            return None
+        username = record.get('author') or ''
+        if not username:
+            self.skip(line_number, 'пустой author')
+            return None
+        author_id = self.author_id(username)
+        if author_id is None:
+            reason = 'недопустимое имя' if self.create_authors else 'нет'
+            self.skip(line_number, f'{reason} автора {username!r}')
+            return None
+        slug = record.get('group') or None
+        group_id = None
+        if slug is not None:
+            group_id = self.groups.get(slug)
+            if group_id is None:
+                self.skip(line_number, f'нет группы {slug!r}')
+                return None
+        pub_date = self.parse_pub_date(record.get('pub_date'))
+        if pub_date is None:
+            self.skip(line_number, 'некорректный pub_date')
+            return None
+        self.feeds.add(cache.author_feed(username))
+        self.timelines.add(timelines.author_timeline(author_id))
+        if slug is not None:
+            self.feeds.add(cache.group_feed(slug))
+            self.timelines.add(timelines.group_timeline(group_id))
+        return Post(
+            text=text,
+            author_id=author_id,
+            group_id=group_id,
+            pub_date=pub_date,
+        )
+
+    def first_not_string(self, record):
+        """Первое заполненное поле записи со значением не строкой."""
+        for name in ('text', 'author', 'group', 'pub_date'):
+            if not isinstance(record.get(name) or '', str):
+                return name
+        return None
+
+    def parse_pub_date(self, value):
+        """Дата (наивная считается UTC) или None, если её не разобрать."""
+        if not value:
+            return timezone.now()
+        try:
+            pub_date = parse_datetime(value)
+        except ValueError:
+            # Формат верный, но дата невозможная, например 13-й месяц.
+            return None
+        if pub_date is not None and timezone.is_naive(pub_date):
+            pub_date = timezone.make_aware(pub_date, timezone.utc)
+        return pub_date
+
+    def write_batch(self, batch):
+        # bulk_create не шлёт сигналы, счётчики обновляются здесь же,
+        # в одной транзакции с постами.
+        authors = Counter(post.author_id for post in batch)
+        groups = Counter(
+            post.group_id for post in batch if post.group_id is not None
+        )
+        with transaction.atomic(), keep_pub_date():
+            Post.objects.bulk_create(batch)
+            counters.change_feed_count(counters.INDEX_FEED, len(batch))
+            for author_id, count in authors.items():
+                counters.change_author_count(author_id, count)
+            for group_id, count in groups.items():
+                counters.change_group_count(group_id, count)
+        self.imported += len(batch)
+        self.feeds.add(cache.INDEX_FEED)
+        self.timelines.add(timelines.INDEX_FEED)
+        self.stdout.write(
+            f'{self.imported} постов, {self.rate():.0f} строк/с'
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import rebuild_counts
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов групп, авторов и общей ленты.'
+
+    def handle(self, *args, **options):
+        rebuild_counts()
+        self.stdout.write(self.style.SUCCESS('Счётчики постов пересчитаны.'))
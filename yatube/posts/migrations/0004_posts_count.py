@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_posts_count(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    Group = apps.get_model('posts', 'Group')
+    AuthorStats = apps.get_model('posts', 'AuthorStats')
+    FeedCounter = apps.get_model('posts', 'FeedCounter')
+    for group in Group.objects.annotate(total=Count('posts')):
+        Group.objects.filter(pk=group.pk).update(posts_count=group.total)
+    AuthorStats.objects.bulk_create(
+        AuthorStats(author_id=user.pk, posts_count=user.total)
+        for user in User.objects.annotate(total=Count('posts'))
+    )
+    FeedCounter.objects.exclude(key='index').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0003_feedcounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('author', models.OneToOneField(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    primary_key=True,
+                    related_name='post_stats',
+                    serialize=False,
+                    to=settings.AUTH_USER_MODEL)),
+                ('posts_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(fill_posts_count, migrations.RunPython.noop),
+    ]
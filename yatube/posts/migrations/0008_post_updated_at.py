@@ -0,0 +1,45 @@
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+# SQLite добавляет столбец пересозданием posts_post, при этом пропадают
+# триггеры полнотекстового индекса, поэтому индекс создаётся заново.
+fts = import_module('posts.migrations.0007_post_fts')
+
+
+def fill_updated_at(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Post.objects.update(updated_at=F('pub_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_post_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            fts.run_on_sqlite(fts.DROP_FTS), fts.run_on_sqlite(fts.CREATE_FTS)
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(
+                fields=['updated_at', 'id'], name='post_updated_at_idx'
+            ),
+        ),
+        migrations.RunPython(
+            fts.run_on_sqlite(fts.CREATE_FTS), fts.run_on_sqlite(fts.DROP_FTS)
+        ),
+    ]
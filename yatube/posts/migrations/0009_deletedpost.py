@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-18 20:51
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedPost',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post_id', models.PositiveIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='deletedpost',
+            index=models.Index(fields=['deleted_at', 'post_id'], name='deleted_post_idx'),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from . import rows
 
 User = get_user_model()
 
@@ -8,11 +11,41 @@ class Group(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True)
     description = models.TextField()
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    # Поля, которые выводят шаблоны лент (includes/post.html и страницы).
+    FEED_FIELDS = (
+        'text',
+        'pub_date',
+        'version',
+        'author',
+        'author__username',
+        'author__first_name',
+        'author__last_name',
+        'group',
+        'group__slug',
+    )
+
+    def for_feed(self):
+        """Посты для ленты с автором и группой за один запрос."""
+        return (
+            self.select_related('author', 'group').
+            only(*self.FEED_FIELDS).
+            order_by('-pub_date', '-pk')
+        )
+
+    def feed_rows(self):
+        """Посты для ленты строками PostRow (posts.rows) без моделей."""
+        queryset = self.order_by('-pub_date', '-pk').values_list(*rows.FIELDS)
+        queryset._iterable_class = rows.PostRowIterable
+        return queryset
+
+
 class Post(models.Model):
     text = models.TextField()
     pub_date = models.DateTimeField(auto_now_add=True)
@@ -28,6 +61,90 @@ class Post(models.Model):
         on_delete=models.SET_NULL,
         related_name='posts',
     )
+    # Растёт при каждом сохранении; входит в ключи кеша фрагментов поста.
+    version = models.PositiveIntegerField(default=1, editable=False)
+    # Время последнего изменения, по нему синхронизируются копии лент
+    # (posts.changes) и ставится Last-Modified поста.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['pub_date', 'id'],
+                name='post_pub_date_idx',
+            ),
+            models.Index(
+                fields=['author', 'pub_date'],
+                name='post_author_pub_date_idx',
+            ),
+            models.Index(
+                fields=['group', 'pub_date'],
+                name='post_group_pub_date_idx',
+            ),
+            models.Index(
+                fields=['updated_at', 'id'],
+                name='post_updated_at_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text[:15]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'version', 'updated_at'
+                }
+        super().save(*args, **kwargs)
+
+
+class DeletedPost(models.Model):
+    """Журнал удалений для posts.changes: копии лент удаляют посты у себя.
+
+    Записи не чистятся, журнал растёт вместе с числом удалений.
+    """
+    post_id = models.PositiveIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['deleted_at', 'post_id'],
+                name='deleted_post_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.post_id}: {self.deleted_at}'
+
+
+class AuthorStats(models.Model):
+    """Денормализованные счётчики автора."""
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_stats',
+    )
+    posts_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.author}: {self.posts_count}'
+
+
+class FeedCounter(models.Model):
+    """Число постов в ленте без привязки к группе или автору.
+
+    Поддерживается сигналами при создании, удалении и переносе постов,
+    чтобы пагинатору не приходилось считать строки на каждом запросе.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    value = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.key}: {self.value}'
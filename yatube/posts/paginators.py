@@ -0,0 +1,168 @@
+from collections.abc import Sequence
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import force_bytes, force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def elided_page_range(number, num_pages, on_each_side=3, on_ends=2):
+    """Номера страниц для навигации с пропусками (None) в длинных лентах.
+
+    Показываются on_ends страниц с каждого края и on_each_side вокруг
+    текущей, поэтому длина списка не зависит от числа страниц.
+    """
+    if num_pages <= (on_each_side + on_ends) * 2:
+        return list(range(1, num_pages + 1))
+    pages = []
+    if number > 1 + on_each_side + on_ends + 1:
+        pages.extend(range(1, on_ends + 1))
+        pages.append(None)
+        pages.extend(range(number - on_each_side, number + 1))
+    else:
+        pages.extend(range(1, number + 1))
+    if number < num_pages - on_each_side - on_ends - 1:
+        pages.extend(range(number + 1, number + on_each_side + 1))
+        pages.append(None)
+        pages.extend(range(num_pages - on_ends + 1, num_pages + 1))
+    else:
+        pages.extend(range(number + 1, num_pages + 1))
+    return pages
+
+
+def encode_position(moment, pk):
+    """Кодирует позицию (время, id) в токен."""
+    value = f'{moment.isoformat()},{pk}'
+    return urlsafe_base64_encode(force_bytes(value))
+
+
+def encode_cursor(post):
+    """Кодирует позицию поста в ленте в токен для ?after=/?before=."""
+    return encode_position(post.pub_date, post.pk)
+
+
+def decode_cursor(token):
+    try:
+        value = force_str(urlsafe_base64_decode(token))
+        raw_date, raw_pk = value.rsplit(',', 1)
+        pub_date = parse_datetime(raw_date)
+        pk = int(raw_pk)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise InvalidCursor(token)
+    if pub_date is None:
+        raise InvalidCursor(token)
+    return pub_date, pk
+
+
+class CursorPage(Sequence):
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} posts>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return encode_cursor(self.object_list[0])
+
+
+def posts_after(queryset, pub_date, pk):
+    """Посты старше позиции (pub_date, pk), от новых к старым.
+
+    Граница pub_date__lte даёт SQLite диапазон индекса: одно условие OR
+    он может выполнить просмотром индекса от начала ленты до позиции.
+    """
+    return queryset.filter(
+        Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk),
+        pub_date__lte=pub_date,
+    ).order_by('-pub_date', '-pk')
+
+
+def posts_before(queryset, pub_date, pk):
+    """Посты новее позиции (pub_date, pk), от старых к новым."""
+    return queryset.filter(
+        Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk),
+        pub_date__gte=pub_date,
+    ).order_by('pub_date', 'pk')
+
+
+class CursorPaginator:
+    """Keyset-пагинатор по (pub_date, id).
+
+    Вместо OFFSET и COUNT(*) каждая страница выбирается условием
+    относительно последнего показанного поста, поэтому стоимость запроса
+    не зависит от глубины страницы.
+    """
+    is_cursor = True
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    def _fetch(self, queryset):
+        # Запрашиваем на один пост больше, чтобы узнать, есть ли продолжение.
+        posts = list(queryset[:self.per_page + 1])
+        return posts[:self.per_page], len(posts) > self.per_page
+
+    def page_after(self, token):
+        pub_date, pk = decode_cursor(token)
+        queryset = posts_after(self.object_list, pub_date, pk)
+        posts, has_next = self._fetch(queryset)
+        return CursorPage(posts, self, has_next, has_previous=True)
+
+    def page_before(self, token):
+        pub_date, pk = decode_cursor(token)
+        queryset = posts_before(self.object_list, pub_date, pk)
+        posts, has_previous = self._fetch(queryset)
+        posts.reverse()
+        return CursorPage(
+            posts, self, has_next=True, has_previous=has_previous
+        )
+
+    def first_page(self):
+        queryset = self.object_list.order_by('-pub_date', '-pk')
+        posts, has_next = self._fetch(queryset)
+        return CursorPage(posts, self, has_next, has_previous=False)
+
+    def get_page(self, after=None, before=None):
+        """Возвращает страницу, при битом токене — первую страницу ленты."""
+        try:
+            if after:
+                return self.page_after(after)
+            if before:
+                page = self.page_before(before)
+                if page.has_previous() or len(page) == self.per_page:
+                    return page
+        except InvalidCursor:
+            pass
+        return self.first_page()
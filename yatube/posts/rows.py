@@ -0,0 +1,92 @@
+"""Лёгкие строки постов для лент вместо экземпляров моделей.
+
+Лента выбирает только поля, которые выводят шаблоны, кортежами
+values_list и оборачивает их в объекты со __slots__. Атрибуты повторяют
+то, к чему обращаются includes/post_card.html и includes/post.html,
+поэтому шаблоны не меняются.
+"""
+from django.db.models.query import ValuesListIterable
+
+FIELDS = (
+    'pk',
+    'text',
+    'pub_date',
+    'version',
+    'author__username',
+    'author__first_name',
+    'author__last_name',
+    'group_id',
+    'group__slug',
+)
+
+
+class AuthorRow:
+    __slots__ = ('username', 'first_name', 'last_name')
+
+    def __init__(self, username, first_name, last_name):
+        self.username = username
+        self.first_name = first_name
+        self.last_name = last_name
+
+    def __str__(self):
+        return self.username
+
+    def get_username(self):
+        return self.username
+
+    def get_full_name(self):
+        return f'{self.first_name} {self.last_name}'.strip()
+
+
+class GroupRow:
+    __slots__ = ('pk', 'slug')
+
+    def __init__(self, pk, slug):
+        self.pk = pk
+        self.slug = slug
+
+    def __str__(self):
+        return self.slug
+
+
+class PostRow:
+    __slots__ = ('pk', 'text', 'pub_date', 'version', 'author', 'group')
+
+    def __init__(self, pk, text, pub_date, version, author, group):
+        self.pk = pk
+        self.text = text
+        self.pub_date = pub_date
+        self.version = version
+        self.author = author
+        self.group = group
+
+    def __repr__(self):
+        return f'<PostRow {self.pk}>'
+
+    @property
+    def id(self):
+        return self.pk
+
+    @property
+    def group_id(self):
+        return self.group.pk if self.group is not None else None
+
+    @classmethod
+    def from_values(cls, values):
+        (pk, text, pub_date, version, username, first_name, last_name,
+         group_id, slug) = values
+        return cls(
+            pk,
+            text,
+            pub_date,
+            version,
+            AuthorRow(username, first_name, last_name),
+            GroupRow(group_id, slug) if group_id is not None else None,
+        )
+
+
+class PostRowIterable(ValuesListIterable):
+    """Итератор queryset, отдающий PostRow вместо кортежей values_list."""
+
+    def __iter__(self):
+        return map(PostRow.from_values, super().__iter__())
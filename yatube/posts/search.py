@@ -0,0 +1,76 @@
+import re
+
+from django.db import connections, router
+
+from .models import Post
+
+FTS_TABLE = 'posts_post_fts'
+WORD_RE = re.compile(r'\w+')
+
+
+def fts_query(query):
+    """Превращает ввод пользователя в запрос FTS5: все слова, как фразы.
+
+    Кавычки и операторы FTS5 из ввода отбрасываются, чтобы пользователь
+    не мог сломать синтаксис MATCH.
+    """
+    return ' '.join(f'"{word}"' for word in WORD_RE.findall(query))
+
+
+class SearchResults:
+    """Найденные посты в порядке релевантности.
+
+    Отдаёт Paginator'у count() и срезы, каждый срез — один запрос
+    к полнотекстовому индексу и один к постам.
+    """
+
+    def __init__(self, query, using):
+        self.match = fts_query(query)
+        # Сырой SQL идёт мимо роутеров, базу выбирает search_posts().
+        self.using = using
+
+    def count(self):
+        if not self.match:
+            return 0
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f'SELECT count(*) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s',
+                [self.match],
+            )
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        if not self.match:
+            return []
+        start = index.start or 0
+        limit = -1 if index.stop is None else index.stop - start
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s OFFSET %s',
+                [self.match, limit, start],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        posts = Post.objects.using(self.using).for_feed().in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+def search_posts(query):
+    """Посты, подходящие под запрос, для Paginator."""
+    using = router.db_for_read(Post)
+    if connections[using].vendor == 'sqlite':
+        return SearchResults(query, using)
+    # Без FTS5 ищем подстроку, как поиск админки.
+    words = WORD_RE.findall(query)
+    if not words:
+        return Post.objects.none()
+    posts = Post.objects.for_feed()
+    for word in words:
+        posts = posts.filter(text__icontains=word)
+    return posts
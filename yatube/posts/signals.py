@@ -0,0 +1,171 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.db.models import F
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import cache, counters, timelines
+from .models import AuthorStats, DeletedPost, Group, Post
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def create_author_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        AuthorStats.objects.get_or_create(author=instance)
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_group(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._previous_group_id = None
+        return
+    instance._previous_group_id = (
+        Post.objects.filter(pk=instance.pk).
+        values_list('group_id', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        counters.change_post_counts(instance, 1)
+        return
+    previous_group_id = getattr(instance, '_previous_group_id', None)
+    if previous_group_id != instance.group_id:
+        counters.change_group_count(previous_group_id, -1)
+        counters.change_group_count(instance.group_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    counters.change_post_counts(instance, -1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_feeds(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    feeds = cache.post_feeds(instance)
+    previous_group_id = getattr(instance, '_previous_group_id', None)
+    if previous_group_id not in (None, instance.group_id):
+        previous_slug = (
+            Group.objects.filter(pk=previous_group_id).
+            values_list('slug', flat=True).first()
+        )
+        if previous_slug is not None:
+            feeds.append(cache.group_feed(previous_slug))
+    cache.invalidate_feeds(feeds)
+
+
+@receiver(post_save, sender=Post)
+def update_post_timelines(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        timelines.add_post(instance)
+        return
+    previous_group_id = getattr(instance, '_previous_group_id', None)
+    if previous_group_id != instance.group_id:
+        timelines.move_post(instance, previous_group_id)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_timelines(sender, instance, **kwargs):
+    timelines.remove_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def drop_deleted_post_fragments(sender, instance, **kwargs):
+    cache.drop_post_fragments(instance)
+
+
+@receiver(post_delete, sender=Post)
+def log_deleted_post(sender, instance, **kwargs):
+    DeletedPost.objects.create(post_id=instance.pk)
+
+
+def bump_post_versions(posts):
+    # Фрагменты постов выводят slug группы и имя автора,
+    # поэтому при их изменении посты получают новую версию.
+    posts.update(version=F('version') + 1, updated_at=timezone.now())
+
+
+@receiver(pre_save, sender=Group)
+def remember_previous_slug(sender, instance, **kwargs):
+    instance._previous_slug = (
+        Group.objects.filter(pk=instance.pk).
+        values_list('slug', flat=True).first()
+        if instance.pk is not None else None
+    )
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_group_feeds(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Ссылки на группу есть на главной и в профилях её авторов.
+    feeds = [cache.INDEX_FEED, cache.group_feed(instance.slug)]
+    previous_slug = getattr(instance, '_previous_slug', None)
+    if previous_slug is not None:
+        feeds.append(cache.group_feed(previous_slug))
+    usernames = (
+        User.objects.filter(posts__group_id=instance.pk).
+        values_list('username', flat=True).distinct()
+    )
+    feeds.extend(cache.author_feed(username) for username in usernames)
+    cache.invalidate_feeds(feeds)
+    if kwargs.get('signal') is pre_delete:
+        timelines.drop([timelines.group_timeline(instance.pk)])
+    if not kwargs.get('created'):
+        bump_post_versions(Post.objects.filter(group_id=instance.pk))
+
+
+def is_login_update(update_fields):
+    # Вход в систему сохраняет только last_login, ленты он не меняет.
+    return update_fields == frozenset({'last_login'})
+
+
+# Поля автора, которые выводят фрагменты постов и ленты.
+RENDERED_AUTHOR_FIELDS = ('username', 'first_name', 'last_name')
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_username(sender, instance, update_fields=None,
+                               **kwargs):
+    if instance.pk is None or is_login_update(update_fields):
+        instance._previous_names = None
+        return
+    instance._previous_names = (
+        User.objects.filter(pk=instance.pk).
+        values_list(*RENDERED_AUTHOR_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_feeds(sender, instance, created, update_fields=None,
+                            raw=False, **kwargs):
+    if created or raw or is_login_update(update_fields):
+        return
+    previous_names = getattr(instance, '_previous_names', None)
+    names = tuple(getattr(instance, name) for name in RENDERED_AUTHOR_FIELDS)
+    if previous_names == names:
+        # Смена пароля, прав и прочих невыводимых полей постов не меняет.
+        return
+    feeds = [cache.INDEX_FEED, cache.author_feed(instance.get_username())]
+    if previous_names is not None:
+        feeds.append(cache.author_feed(previous_names[0]))
+    slugs = (
+        Group.objects.filter(posts__author=instance).
+        values_list('slug', flat=True).distinct()
+    )
+    feeds.extend(cache.group_feed(slug) for slug in slugs)
+    cache.invalidate_feeds(feeds)
+    bump_post_versions(Post.objects.filter(author_id=instance.pk))
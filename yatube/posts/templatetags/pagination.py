@@ -0,0 +1,11 @@
+from django import template
+
+from posts.paginators import elided_page_range as build_page_range
+
+register = template.Library()
+
+
+@register.simple_tag
+def elided_page_range(page_obj):
+    """{% elided_page_range page_obj as pages %}: номера для paginator.html."""
+    return build_page_range(page_obj.number, page_obj.paginator.num_pages)
@@ -0,0 +1,209 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.checks import run_checks
+from django.core.cache.utils import make_template_fragment_key
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(POSTS_PAGE_CACHE=True)
+class FeedPageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый текст поста',
+            group=cls.group,
+        )
+        cls.feeds = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user.username}),
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_guest_page_is_served_from_cache(self):
+        for url in self.feeds:
+            with self.subTest(url=url):
+                first = self.guest_client.get(url)
+                with self.assertNumQueries(0):
+                    second = self.guest_client.get(url)
+                self.assertEqual(first.content, second.content)
+
+    def test_authorized_pages_are_not_cached(self):
+        self.authorized_client.get(self.feeds[0])
+        response = self.authorized_client.get(self.feeds[0])
+        self.assertIn('page_obj', response.context)
+
+    def test_post_create_invalidates_its_feeds(self):
+        for url in self.feeds:
+            self.guest_client.get(url)
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Свежий пост', 'group': self.group.pk},
+        )
+        for url in self.feeds:
+            with self.subTest(url=url):
+                self.assertContains(self.guest_client.get(url), 'Свежий пост')
+
+    def test_post_edit_invalidates_old_and_new_group(self):
+        other_url = reverse(
+            'posts:group_list', kwargs={'slug': self.other_group.slug}
+        )
+        for url in self.feeds + [other_url]:
+            self.guest_client.get(url)
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Исправленный текст', 'group': self.other_group.pk},
+        )
+        self.assertNotContains(
+            self.guest_client.get(self.feeds[1]), 'Исправленный текст'
+        )
+        self.assertContains(
+            self.guest_client.get(other_url), 'Исправленный текст'
+        )
+        self.assertContains(
+            self.guest_client.get(self.feeds[0]), 'Исправленный текст'
+        )
+
+    def test_untouched_feed_stays_cached(self):
+        other_url = reverse(
+            'posts:group_list', kwargs={'slug': self.other_group.slug}
+        )
+        self.guest_client.get(other_url)
+        Post.objects.create(author=self.user, text='Пост', group=self.group)
+        with self.assertNumQueries(0):
+            self.guest_client.get(other_url)
+
+    def test_group_change_invalidates_feeds(self):
+        self.guest_client.get(self.feeds[0])
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'renamed'
+        group.save()
+        self.assertContains(
+            self.guest_client.get(self.feeds[0]), '/group/renamed/'
+        )
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'post-fragments-tests',
+    },
+})
+class PostFragmentCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        caches['template_fragments'].clear()
+        self.post = Post.objects.create(
+            author=self.user,
+            text='Тестовый текст поста',
+            group=self.group,
+        )
+        self.client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def fragment(self, post):
+        return caches['template_fragments'].get(
+            make_template_fragment_key('post_text', [post.pk, post.version])
+        )
+
+    def test_post_text_is_shared_between_feed_and_detail(self):
+        self.client.get(reverse('posts:index'))
+        fragment = self.fragment(self.post)
+        self.assertIn('Тестовый текст поста', fragment)
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+        self.assertContains(response, fragment, html=False)
+
+    def test_edit_renders_new_version(self):
+        self.client.get(reverse('posts:index'))
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Исправленный текст', 'group': self.group.pk},
+        )
+        self.assertContains(
+            self.client.get(reverse('posts:index')), 'Исправленный текст'
+        )
+
+    def test_group_change_renders_new_links(self):
+        self.client.get(reverse('posts:index'))
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'renamed'
+        group.save()
+        self.assertContains(
+            self.client.get(reverse('posts:index')), '/group/renamed/'
+        )
+
+    def test_delete_drops_fragments(self):
+        self.client.get(reverse('posts:index'))
+        post = Post.objects.get(pk=self.post.pk)
+        post.delete()
+        post.pk = self.post.pk
+        self.assertIsNone(self.fragment(post))
+
+
+class SharedCacheCheckTests(TestCase):
+    MEMCACHED = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION': '127.0.0.1:11211',
+        },
+    }
+
+    def warnings(self):
+        return [
+            message.id for message in run_checks()
+            if message.id == 'posts.W001'
+        ]
+
+    def test_page_cache_needs_shared_cache(self):
+        self.assertEqual(self.warnings(), [])
+        with override_settings(POSTS_PAGE_CACHE=True):
+            self.assertEqual(self.warnings(), ['posts.W001'])
+        with override_settings(POSTS_PAGE_CACHE=True, CACHES=self.MEMCACHED):
+            self.assertEqual(self.warnings(), [])
+
+    def test_timelines_need_shared_cache(self):
+        with override_settings(POSTS_TIMELINES=True):
+            self.assertEqual(self.warnings(), ['posts.W001'])
+        with override_settings(
+            POSTS_TIMELINES=True, POSTS_TIMELINE_CACHE='default',
+            CACHES=self.MEMCACHED,
+        ):
+            self.assertEqual(self.warnings(), [])
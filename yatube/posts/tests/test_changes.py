@@ -0,0 +1,142 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from .. import changes
+from ..models import Group, Post
+from .utils import query_plans
+
+User = get_user_model()
+
+
+@override_settings(POSTS_CHANGES_SETTLE_SECONDS=0)
+class PostChangesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Тестовое описание',
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.user, text=f'Пост {i}', group=cls.group
+            )
+            for i in range(3)
+        ]
+        cls.url = reverse('posts:post_changes')
+
+    def setUp(self):
+        self.client = Client()
+
+    def changes(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_changes_are_paged_by_watermark(self):
+        first = self.changes(limit=2)
+        self.assertEqual(
+            [post['id'] for post in first['posts']],
+            [post.pk for post in self.posts[:2]],
+        )
+        self.assertTrue(first['has_more'])
+        second = self.changes(since=first['next'], limit=2)
+        self.assertEqual(
+            [post['id'] for post in second['posts']], [self.posts[2].pk]
+        )
+        self.assertFalse(second['has_more'])
+        third = self.changes(since=second['next'])
+        self.assertEqual(third['posts'], [])
+        self.assertEqual(third['next'], second['next'])
+
+    def test_edit_moves_post_past_watermark(self):
+        watermark = self.changes()['next']
+        post = Post.objects.get(pk=self.posts[0].pk)
+        post.text = 'Исправленный текст'
+        post.save(update_fields=['text'])
+        changed = self.changes(since=watermark)['posts']
+        self.assertEqual(len(changed), 1)
+        self.assertEqual(changed[0]['text'], 'Исправленный текст')
+        self.assertEqual(changed[0]['version'], 2)
+
+    def test_deleted_posts_are_reported(self):
+        watermark = self.changes()['next']
+        deleted_pk = self.posts[1].pk
+        Post.objects.filter(pk=deleted_pk).delete()
+        changed = self.changes(since=watermark)
+        self.assertEqual(len(changed['posts']), 1)
+        self.assertEqual(changed['posts'][0]['id'], deleted_pk)
+        self.assertTrue(changed['posts'][0]['deleted'])
+        self.assertEqual(self.changes(since=changed['next'])['posts'], [])
+
+    def test_edits_and_deletions_share_one_stream(self):
+        watermark = self.changes()['next']
+        Post.objects.filter(pk=self.posts[0].pk).delete()
+        post = Post.objects.get(pk=self.posts[2].pk)
+        post.text = 'Исправленный текст'
+        post.save(update_fields=['text'])
+        first = self.changes(since=watermark, limit=1)
+        self.assertTrue(first['has_more'])
+        second = self.changes(since=first['next'])
+        self.assertEqual(
+            [
+                (change['id'], change['deleted'])
+                for change in first['posts'] + second['posts']
+            ],
+            [(self.posts[0].pk, True), (self.posts[2].pk, False)],
+        )
+
+    def test_group_rename_marks_its_posts_changed(self):
+        watermark = self.changes()['next']
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'renamed'
+        group.save()
+        changed = self.changes(since=watermark)['posts']
+        self.assertEqual(len(changed), 3)
+        self.assertEqual({post['group'] for post in changed}, {'renamed'})
+
+    def test_pages_use_index_order(self):
+        # Из одного условия OR не всякий SQLite строит диапазон индекса:
+        # без явной границы он сортирует все строки после знака.
+        since = changes.parse_since(self.changes()['next'])
+        plans = query_plans(lambda: changes.changed_posts(since))
+        self.assertEqual(len(plans), 2)
+        checks = (
+            ('"updated_at" >= ', 'post_updated_at_idx'),
+            ('"deleted_at" >= ', 'deleted_post_idx'),
+        )
+        for (sql, plan), (bound, index) in zip(plans, checks):
+            with self.subTest(index=index):
+                self.assertIn(bound, sql)
+                self.assertIn(f'INDEX {index}', plan)
+                self.assertNotIn('TEMP B-TREE', plan)
+                self.assertNotIn('MULTI-INDEX OR', plan)
+
+    def test_author_changes_mark_posts_only_when_rendered(self):
+        watermark = self.changes()['next']
+        author = User.objects.get(pk=self.user.pk)
+        author.set_password('new-password')
+        author.is_staff = True
+        author.save()
+        self.assertEqual(self.changes(since=watermark)['posts'], [])
+        author.first_name = 'Имя'
+        author.save()
+        changed = self.changes(since=watermark)['posts']
+        self.assertEqual(len(changed), 3)
+
+    def test_since_accepts_date(self):
+        self.assertEqual(len(self.changes(since='2000-01-01')['posts']), 3)
+        self.assertEqual(self.changes(since='2999-01-01')['posts'], [])
+
+    def test_invalid_parameters(self):
+        for params in ({'since': 'мусор'}, {'limit': '0'}, {'limit': 'x'}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+
+    @override_settings(POSTS_CHANGES_SETTLE_SECONDS=60)
+    def test_fresh_changes_are_held_back(self):
+        self.assertEqual(self.changes()['posts'], [])
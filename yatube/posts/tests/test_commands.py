@@ -0,0 +1,179 @@
+import json
+import os
+import tempfile
+from http import HTTPStatus
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import counters
+from ..models import AuthorStats, Group, Post
+
+User = get_user_model()
+
+
+class ImportPostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Тестовое описание',
+        )
+
+    def write_file(self, suffix, content):
+        file = tempfile.NamedTemporaryFile(
+            'w', suffix=suffix, encoding='utf-8', delete=False
+        )
+        with file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def import_posts(self, path, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_posts', path, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_jsonl(self):
+        records = [
+            {
+                'text': f'Пост {i}',
+                'author': 'Name',
+                'group': 'group',
+                'pub_date': f'2020-01-0{i + 1}T10:00:00',
+            }
+            for i in range(5)
+        ]
+        records.append({'text': 'Чужой пост', 'author': 'Unknown'})
+        path = self.write_file(
+            '.jsonl', '\n'.join(json.dumps(record) for record in records)
+        )
+        stdout, stderr = self.import_posts(path, '--batch-size', '2')
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertIn("'Unknown'", stderr)
+        self.assertIn('Импортировано постов: 5, пропущено: 1', stdout)
+        first = Post.objects.order_by('pub_date').first()
+        self.assertEqual(first.text, 'Пост 0')
+        self.assertEqual(first.pub_date.year, 2020)
+        self.assertEqual(Group.objects.get(pk=self.group.pk).posts_count, 5)
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).posts_count, 5
+        )
+
+    def test_invalid_values_are_skipped(self):
+        lines = [
+            '{"text": 5, "author": "Name"}',
+            '"abc"',
+            '{"text": "Дата", "author": "Name", '
+            '"pub_date": "2023-13-01T00:00:00"}',
+            '{"text": "Автор", "author": ["Name"]}',
+            '{"text": "Верный пост", "author": "Name"}',
+        ]
+        path = self.write_file('.jsonl', '\n'.join(lines))
+        stdout, stderr = self.import_posts(path)
+        self.assertIn('Импортировано постов: 1, пропущено: 4', stdout)
+        for line_number in range(1, 5):
+            self.assertIn(f'Строка {line_number} пропущена', stderr)
+        self.assertEqual(Post.objects.get().text, 'Верный пост')
+
+    def test_invalid_authors_are_not_created(self):
+        lines = [
+            '{"text": "Без автора"}',
+            '{"text": "Пустой автор", "author": ""}',
+            '{"text": "Пробел в имени", "author": "два слова"}',
+            '{"text": "Длинное имя", "author": "%s"}' % ('x' * 151),
+            '{"text": "Верный пост", "author": "NewAuthor"}',
+        ]
+        path = self.write_file('.jsonl', '\n'.join(lines))
+        stdout, _ = self.import_posts(path, '--create-authors')
+        self.assertIn('Импортировано постов: 1, пропущено: 4', stdout)
+        self.assertEqual(
+            set(User.objects.values_list('username', flat=True)),
+            {'Name', 'NewAuthor'},
+        )
+
+    def test_import_csv_creates_authors(self):
+        path = self.write_file(
+            '.csv',
+            'text,author,group\n'
+            'Первый пост,Name,\n'
+            'Второй пост,NewAuthor,group\n',
+        )
+        self.import_posts(path, '--create-authors')
+        new_author = User.objects.get(username='NewAuthor')
+        self.assertTrue(
+            Post.objects.filter(author=new_author, group=self.group).exists()
+        )
+        self.assertEqual(
+            counters.get_count(counters.INDEX_FEED, Post.objects.all()), 2
+        )
+        self.assertEqual(
+            AuthorStats.objects.get(author=new_author).posts_count, 1
+        )
+
+
+class ExportPostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        cls.staff = User.objects.create_user(username='Staff', is_staff=True)
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Пост в группе',
+            group=cls.group,
+        )
+        cls.other_post = Post.objects.create(
+            author=cls.user,
+            text='Пост без группы',
+        )
+
+    def test_command_exports_jsonl(self):
+        stdout = StringIO()
+        call_command('export_posts', '--group', 'group', stdout=stdout)
+        rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['text'], 'Пост в группе')
+        self.assertEqual(rows[0]['author'], 'Name')
+        self.assertEqual(rows[0]['group'], 'group')
+
+    def test_export_can_be_imported_back(self):
+        stdout = StringIO()
+        call_command('export_posts', '--format', 'csv', stdout=stdout)
+        Post.objects.all().delete()
+        file = tempfile.NamedTemporaryFile(
+            'w', suffix='.csv', encoding='utf-8', newline='', delete=False
+        )
+        with file:
+            file.write(stdout.getvalue())
+        self.addCleanup(os.remove, file.name)
+        call_command('import_posts', file.name, stdout=StringIO())
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            ['Пост без группы', 'Пост в группе'],
+        )
+
+    def test_endpoint_streams_for_staff_only(self):
+        url = reverse('posts:export')
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        client.force_login(self.staff)
+        response = client.get(url, {'format': 'csv', 'since': '2000-01-01'})
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(len(content.splitlines()), 3)
+        response = client.get(url, {'since': 'вчера'})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
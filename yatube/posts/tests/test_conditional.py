@@ -0,0 +1,160 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.checks import run_checks
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(POSTS_CONDITIONAL_GET=True)
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый текст поста',
+            group=cls.group,
+        )
+        cls.feeds = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user.username}),
+        ]
+        cls.detail = reverse(
+            'posts:post_detail', kwargs={'post_id': cls.post.pk}
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_guest_gets_validators(self):
+        for url in self.feeds + [self.detail]:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertTrue(response.has_header('ETag'))
+                self.assertIn('public', response['Cache-Control'])
+                self.assertIn('Cookie', response['Vary'])
+        for url in (self.feeds[0], self.detail):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_unchanged_feed_is_not_rendered(self):
+        for url in self.feeds:
+            with self.subTest(url=url):
+                etag = self.guest_client.get(url)['ETag']
+                with self.assertNumQueries(0):
+                    response = self.guest_client.get(
+                        url, HTTP_IF_NONE_MATCH=etag
+                    )
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+
+    def test_if_modified_since(self):
+        last_modified = self.guest_client.get(self.feeds[0])['Last-Modified']
+        response = self.guest_client.get(
+            self.feeds[0], HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_post_if_modified_since(self):
+        last_modified = self.guest_client.get(self.detail)['Last-Modified']
+        response = self.guest_client.get(
+            self.detail, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_post_changes_feed_etag(self):
+        etags = [self.guest_client.get(url)['ETag'] for url in self.feeds]
+        Post.objects.create(author=self.user, text='Пост', group=self.group)
+        for url, etag in zip(self.feeds, etags):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_edit_changes_post_etag(self):
+        etag = self.guest_client.get(self.detail)['ETag']
+        response = self.guest_client.get(self.detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Исправленный текст', 'group': self.group.pk},
+        )
+        response = self.guest_client.get(self.detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, 'Исправленный текст')
+
+    def test_authorized_pages_are_private(self):
+        guest_etag = self.guest_client.get(self.detail)['ETag']
+        response = self.authorized_client.get(self.detail)
+        self.assertNotEqual(response['ETag'], guest_etag)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertFalse(response.has_header('Last-Modified'))
+        response = self.authorized_client.get(
+            self.detail, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('private', response['Cache-Control'])
+
+
+def worker_cache(location):
+    """CACHES воркера: LocMemCache с одним LOCATION делят хранилище."""
+    return {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': location,
+        },
+    }
+
+
+@override_settings(POSTS_CONDITIONAL_GET=True)
+class WorkerCacheTests(TestCase):
+    """Два воркера: с общим кешем версий лент и каждый со своим."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        Post.objects.create(author=cls.user, text='Тестовый текст поста')
+        cls.url = reverse('posts:index')
+
+    def get(self, location, **headers):
+        with override_settings(CACHES=worker_cache(location)):
+            return Client().get(self.url, **headers)
+
+    def test_shared_cache_keeps_validators_between_workers(self):
+        etag = self.get('shared')['ETag']
+        self.assertEqual(self.get('shared')['ETag'], etag)
+        self.assertEqual(
+            self.get('shared', HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+        # Пост публикуется через первый воркер, второй видит новую версию.
+        with override_settings(CACHES=worker_cache('shared')):
+            Post.objects.create(author=self.user, text='Новый пост')
+        response = self.get('shared', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_process_local_caches_are_reported(self):
+        # В кешах разных процессов у одной ленты разные валидаторы,
+        # а сброс после записи видит только один из них.
+        self.assertNotEqual(
+            self.get('worker-a')['ETag'], self.get('worker-b')['ETag']
+        )
+        warnings = [
+            message.id for message in run_checks()
+            if message.id == 'posts.W001'
+        ]
+        self.assertEqual(warnings, ['posts.W001'])
@@ -0,0 +1,107 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import counters
+from ..models import AuthorStats, FeedCounter, Group, Post
+
+User = get_user_model()
+
+
+class PostCountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        cls.group1 = Group.objects.create(
+            title='Группа1',
+            slug='group1',
+            description='Тестовое описание',
+        )
+        cls.group2 = Group.objects.create(
+            title='Группа2',
+            slug='group2',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый текст поста',
+            group=cls.group1,
+        )
+
+    def counts(self):
+        return {
+            'index': counters.get_count(
+                counters.INDEX_FEED, Post.objects.all()
+            ),
+            'author': AuthorStats.objects.get(author=self.user).posts_count,
+            'group1': Group.objects.get(pk=self.group1.pk).posts_count,
+            'group2': Group.objects.get(pk=self.group2.pk).posts_count,
+        }
+
+    def test_index_counter_is_filled_once(self):
+        counters.get_count(counters.INDEX_FEED, Post.objects.all())
+        with self.assertNumQueries(1):
+            value = counters.get_count(counters.INDEX_FEED, Post.objects)
+        self.assertEqual(value, 1)
+
+    def test_counters_follow_create_move_and_delete(self):
+        self.counts()
+        new_post = Post.objects.create(
+            author=self.user,
+            text='Новый пост',
+            group=self.group1,
+        )
+        self.assertEqual(
+            self.counts(),
+            {'index': 2, 'author': 2, 'group1': 2, 'group2': 0},
+        )
+        new_post.group = self.group2
+        new_post.save()
+        self.assertEqual(
+            self.counts(),
+            {'index': 2, 'author': 2, 'group1': 1, 'group2': 1},
+        )
+        new_post.delete()
+        self.assertEqual(
+            self.counts(),
+            {'index': 1, 'author': 1, 'group1': 1, 'group2': 0},
+        )
+
+    def test_author_delete_keeps_counters_consistent(self):
+        author = User.objects.create_user(username='Other')
+        Post.objects.create(author=author, text='Пост', group=self.group1)
+        author.delete()
+        self.assertFalse(AuthorStats.objects.filter(author=author).exists())
+        self.assertEqual(self.counts()['group1'], 1)
+
+    def test_pages_of_author_without_stats(self):
+        # Так выглядит автор из loaddata или bulk_create.
+        pages = [
+            (
+                reverse('posts:profile', kwargs={'username': 'Name'}),
+                'Всего постов: 1',
+            ),
+            (
+                reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+                'Всего постов автора:  <span >1</span>',
+            ),
+        ]
+        for url, text in pages:
+            with self.subTest(url=url):
+                AuthorStats.objects.filter(author=self.user).delete()
+                self.assertContains(Client().get(url), text)
+                self.assertEqual(self.counts()['author'], 1)
+
+    def test_rebuild_command(self):
+        Group.objects.update(posts_count=100)
+        AuthorStats.objects.all().delete()
+        FeedCounter.objects.create(key=counters.INDEX_FEED, value=100)
+        call_command('rebuild_post_counters', stdout=StringIO())
+        self.assertEqual(
+            self.counts(),
+            {'index': 1, 'author': 1, 'group1': 1, 'group2': 0},
+        )
@@ -0,0 +1,117 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..counters import INDEX_FEED
+from ..models import FeedCounter, Group, Post
+from ..paginators import CursorPaginator, elided_page_range, encode_cursor
+from .utils import query_plans
+
+User = get_user_model()
+
+
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, group=cls.group, text=f'Пост {i}')
+            for i in range(23)
+        )
+        # bulk_create ставит всем постам почти одинаковый pub_date,
+        # пагинатор должен различать их по id.
+        cls.posts = list(Post.objects.order_by('-pub_date', '-pk'))
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_pages_cover_feed_without_gaps(self):
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        page = paginator.get_page()
+        seen = list(page)
+        self.assertFalse(page.has_previous())
+        while page.has_next():
+            page = paginator.get_page(after=page.next_cursor)
+            seen.extend(page)
+        self.assertEqual(seen, self.posts)
+        self.assertEqual(len(page), 3)
+
+    def test_before_returns_previous_page(self):
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        second = paginator.get_page(after=encode_cursor(self.posts[9]))
+        first = paginator.get_page(before=second.previous_cursor)
+        self.assertEqual(list(first), self.posts[:10])
+        self.assertTrue(first.has_next())
+
+    def test_cursor_pages_search_index_range(self):
+        # Из одного условия OR не всякий SQLite строит диапазон индекса,
+        # без явной границы по pub_date он просматривает индекс от начала
+        # ленты до курсора.
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        cursor = encode_cursor(self.posts[9])
+        pages = (
+            (lambda: paginator.page_after(cursor), '"pub_date" <= '),
+            (lambda: paginator.page_before(cursor), '"pub_date" >= '),
+        )
+        for page, bound in pages:
+            with self.subTest(bound=bound):
+                [(sql, plan)] = query_plans(page)
+                self.assertIn(bound, sql)
+                self.assertIn('SEARCH posts_post USING INDEX', plan)
+                self.assertNotIn('SCAN posts_post', plan)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        page = paginator.get_page(after='not-a-cursor')
+        self.assertEqual(list(page), self.posts[:10])
+
+    def test_feeds_accept_cursor(self):
+        after = encode_cursor(self.posts[9])
+        pages_names = [
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': self.user.username}),
+        ]
+        for reverse_name in pages_names:
+            with self.subTest(reverse_name=reverse_name):
+                response = self.client.get(reverse_name, {'after': after})
+                page_obj = response.context['page_obj']
+                self.assertEqual(list(page_obj), self.posts[10:20])
+                self.assertContains(response, f'?after={page_obj.next_cursor}')
+                self.assertContains(
+                    response, f'?before={page_obj.previous_cursor}'
+                )
+
+
+class ElidedPageRangeTests(TestCase):
+    def test_short_feed_is_not_elided(self):
+        self.assertEqual(elided_page_range(3, 5), [1, 2, 3, 4, 5])
+
+    def test_window_around_current_page(self):
+        self.assertEqual(
+            elided_page_range(50, 100),
+            [1, 2, None, 47, 48, 49, 50, 51, 52, 53, None, 99, 100],
+        )
+        self.assertEqual(
+            elided_page_range(1, 100), [1, 2, 3, 4, None, 99, 100]
+        )
+        self.assertEqual(
+            elided_page_range(100, 100), [1, 2, None, 97, 98, 99, 100]
+        )
+
+    def test_paginator_size_does_not_depend_on_feed_length(self):
+        user = User.objects.create_user(username='Name')
+        Post.objects.create(author=user, text='Пост')
+        FeedCounter.objects.update_or_create(
+            key=INDEX_FEED, defaults={'value': 500000}
+        )
+        response = Client().get(reverse('posts:index'), {'page': 20000})
+        self.assertEqual(response.context['page_obj'].number, 20000)
+        self.assertLess(response.content.decode().count('page-item'), 20)
+        self.assertContains(response, '?page=50000')
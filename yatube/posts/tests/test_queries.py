@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+# Сессия и пользователь авторизованного клиента.
+AUTH_QUERIES = 2
+
+
+class QueryBudgetTests(TestCase):
+    """Число запросов страницы не должно зависеть от числа постов на ней."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Тестовое описание',
+        )
+        cls.user = User.objects.create_user(
+            username='Name', first_name='Имя', last_name='Фамилия'
+        )
+        for i in range(15):
+            author = User.objects.create_user(username=f'author{i}')
+            Post.objects.create(
+                author=author,
+                text=f'Тестовый текст поста {i}',
+                group=cls.group,
+            )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый текст поста',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def assertQueryBudget(self, client, url, budget):
+        # Первый запрос может заполнить счётчик ленты, меряем второй.
+        client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        queries = '\n'.join(query['sql'] for query in context.captured_queries)
+        self.assertLessEqual(
+            len(context),
+            budget,
+            f'{url}: {len(context)} запросов при бюджете {budget}\n{queries}',
+        )
+
+    def test_views_stay_within_budget(self):
+        budgets = {
+            reverse('posts:index'): 2,
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}): 2,
+            reverse('posts:profile', kwargs={'username': self.user.username}):
+            2,
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id}): 1,
+        }
+        for url, budget in budgets.items():
+            with self.subTest(url=url):
+                self.assertQueryBudget(self.guest_client, url, budget)
+                self.assertQueryBudget(
+                    self.authorized_client, url, budget + AUTH_QUERIES
+                )
+
+    def test_forms_stay_within_budget(self):
+        budgets = {
+            reverse('posts:post_create'): 1,
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}): 2,
+        }
+        for url, budget in budgets.items():
+            with self.subTest(url=url):
+                self.assertQueryBudget(
+                    self.authorized_client, url, budget + AUTH_QUERIES
+                )
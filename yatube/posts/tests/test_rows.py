@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+from ..rows import PostRow
+
+User = get_user_model()
+
+
+class FeedRowsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='Name', first_name='Имя', last_name='Фамилия'
+        )
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Тестовое описание',
+        )
+        for i in range(13):
+            Post.objects.create(
+                author=cls.user,
+                text=f'Тестовый текст поста {i}',
+                group=cls.group if i % 2 else None,
+            )
+        cls.urls = [
+            reverse('posts:index'),
+            reverse('posts:index') + '?page=2',
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user.username}),
+        ]
+
+    def setUp(self):
+        caches['timelines'].clear()
+        self.client = Client()
+
+    def test_rows_expose_template_attributes(self):
+        row = Post.objects.filter(group=self.group).feed_rows()[0]
+        post = Post.objects.filter(group=self.group).for_feed()[0]
+        self.assertIsInstance(row, PostRow)
+        for attribute in ('pk', 'id', 'text', 'pub_date', 'version'):
+            with self.subTest(attribute=attribute):
+                self.assertEqual(
+                    getattr(row, attribute), getattr(post, attribute)
+                )
+        self.assertEqual(row.author.get_full_name(), 'Имя Фамилия')
+        self.assertEqual(row.author.get_username(), 'Name')
+        self.assertEqual(row.group.slug, 'group')
+        self.assertIsNone(
+            Post.objects.filter(group=None).feed_rows()[0].group
+        )
+
+    def test_feeds_render_identically(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                expected = self.client.get(url).content
+                with override_settings(POSTS_FEED_ROWS=True):
+                    response = self.client.get(url)
+                self.assertIsInstance(
+                    response.context['page_obj'][0], PostRow
+                )
+                self.assertEqual(response.content, expected)
+
+    @override_settings(POSTS_FEED_ROWS=True, POSTS_TIMELINES=True)
+    def test_rows_work_with_timelines_and_cursor(self):
+        for params in ({}, {'after': ''}):
+            with self.subTest(params=params):
+                response = self.client.get(reverse('posts:index'), params)
+                self.assertEqual(len(response.context['page_obj']), 10)
+        response = self.client.get(reverse('posts:index'), {'after': ''})
+        next_cursor = response.context['page_obj'].next_cursor
+        response = self.client.get(
+            reverse('posts:index'), {'after': next_cursor}
+        )
+        self.assertEqual(len(response.context['page_obj']), 3)
@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Post
+
+User = get_user_model()
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Кот сидит на окне',
+        )
+        cls.other_post = Post.objects.create(
+            author=cls.user,
+            text='Собака спит у двери',
+        )
+
+    def setUp(self):
+        self.client = Client()
+
+    def search(self, query, **params):
+        response = self.client.get(
+            reverse('posts:search'), {'q': query, **params}
+        )
+        return list(response.context['page_obj'])
+
+    def test_search_finds_matching_posts(self):
+        self.assertEqual(self.search('КОТ'), [self.post])
+        self.assertEqual(self.search('кот окне'), [self.post])
+        self.assertEqual(self.search('кот двери'), [])
+
+    def test_index_follows_edit_and_delete(self):
+        post = Post.objects.get(pk=self.other_post.pk)
+        post.text = 'Кот спит у двери'
+        post.save()
+        self.assertCountEqual(self.search('кот'), [self.post, post])
+        self.assertEqual(self.search('собака'), [])
+        post.delete()
+        self.assertEqual(self.search('кот'), [self.post])
+
+    def test_results_are_ranked(self):
+        best = Post.objects.create(
+            author=self.user, text='Кот кот кот и ещё раз кот'
+        )
+        self.assertEqual(self.search('кот')[0], best)
+
+    def test_query_syntax_is_escaped(self):
+        for query in ('"', 'кот OR', 'NEAR(', '*', ''):
+            with self.subTest(query=query):
+                response = self.client.get(
+                    reverse('posts:search'), {'q': query}
+                )
+                self.assertEqual(response.status_code, 200)
+
+    def test_pagination_keeps_query(self):
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'Кот номер {i}') for i in range(12)
+        )
+        self.assertEqual(len(self.search('кот', page=2)), 3)
+        response = self.client.get(reverse('posts:search'), {'q': 'кот'})
+        self.assertContains(response, '?q=%D0%BA%D0%BE%D1%82&amp;page=2')
@@ -0,0 +1,194 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import timelines
+from ..cache import INDEX_FEED
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(POSTS_TIMELINES=True, POSTS_TIMELINE_SIZE=15)
+class IndexTimelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f'Пост {i}') for i in range(25)
+        )
+
+    def setUp(self):
+        caches['timelines'].clear()
+        self.client = Client()
+
+    def page_ids(self, page):
+        response = self.client.get(reverse('posts:index'), {'page': page})
+        return [post.pk for post in response.context['page_obj']]
+
+    def expected_ids(self, page):
+        posts = Post.objects.order_by('-pub_date', '-pk')
+        return list(
+            posts.values_list('pk', flat=True)[(page - 1) * 10:page * 10]
+        )
+
+    def test_pages_match_database_order(self):
+        for page in (1, 2, 3):
+            with self.subTest(page=page):
+                self.assertEqual(self.page_ids(page), self.expected_ids(page))
+
+    def test_covered_page_skips_sorting(self):
+        self.client.get(reverse('posts:index'))
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse('posts:index'))
+        post_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "posts_post"' in query['sql']
+        ]
+        self.assertEqual(len(post_queries), 1)
+        self.assertNotIn('ORDER BY', post_queries[0])
+
+    def test_new_post_is_added_on_top(self):
+        self.page_ids(1)
+        post = Post.objects.create(author=self.user, text='Новый пост')
+        entries, _ = caches['timelines'].get(
+            f'posts:timeline:{INDEX_FEED}'
+        )
+        self.assertEqual(entries[-1], (post.pub_date, post.pk))
+        self.assertEqual(len(entries), 15)
+        self.assertEqual(self.page_ids(1)[0], post.pk)
+
+    def test_deleted_post_is_removed(self):
+        first = self.page_ids(1)[0]
+        Post.objects.get(pk=first).delete()
+        self.assertEqual(self.page_ids(1), self.expected_ids(1))
+
+    def test_missing_post_rebuilds_timeline(self):
+        self.page_ids(1)
+        timelines._update(
+            INDEX_FEED, timelines._insert((timezone.now(), 10 ** 6))
+        )
+        self.assertEqual(self.page_ids(1), self.expected_ids(1))
+        self.assertNotIn(10 ** 6, self.page_ids(1))
+
+
+@override_settings(POSTS_TIMELINES=True, POSTS_TIMELINE_SIZE=15)
+class GroupAuthorTimelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Name')
+        cls.group = Group.objects.create(
+            title='Группа',
+            slug='group',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f'Пост {i}', group=cls.group)
+            for i in range(12)
+        )
+
+    def setUp(self):
+        caches['timelines'].clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def page_ids(self, url):
+        response = self.authorized_client.get(url)
+        return [post.pk for post in response.context['page_obj']]
+
+    def group_url(self, group):
+        return reverse('posts:group_list', kwargs={'slug': group.slug})
+
+    def expected_ids(self, posts):
+        return list(
+            posts.order_by('-pub_date', '-pk').values_list('pk', flat=True)
+        )[:10]
+
+    def test_feeds_match_database_order(self):
+        profile_url = reverse(
+            'posts:profile', kwargs={'username': self.user.username}
+        )
+        for url, posts in (
+            (self.group_url(self.group), self.group.posts.all()),
+            (profile_url, self.user.posts.all()),
+        ):
+            with self.subTest(url=url):
+                self.page_ids(url)
+                self.assertEqual(self.page_ids(url), self.expected_ids(posts))
+
+    def test_post_moves_between_group_timelines(self):
+        self.page_ids(self.group_url(self.group))
+        self.page_ids(self.group_url(self.other_group))
+        post = self.group.posts.latest('pub_date')
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+            data={'text': 'Перенесённый пост', 'group': self.other_group.pk},
+        )
+        self.assertNotIn(post.pk, self.page_ids(self.group_url(self.group)))
+        self.assertEqual(
+            self.page_ids(self.group_url(self.other_group)), [post.pk]
+        )
+        entries, _ = caches['timelines'].get(
+            'posts:timeline:' + timelines.group_timeline(self.other_group.pk)
+        )
+        self.assertEqual(entries, [(post.pub_date, post.pk)])
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'template_fragments': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        },
+        'timelines': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'timelines-eviction-tests',
+            'OPTIONS': {'MAX_ENTRIES': 3, 'CULL_FREQUENCY': 3},
+        },
+    })
+    def test_cold_timelines_are_evicted(self):
+        groups = [
+            Group.objects.create(
+                title=f'Группа {i}', slug=f'group{i}', description='Описание'
+            )
+            for i in range(3)
+        ]
+        self.page_ids(self.group_url(self.group))
+        self.page_ids(self.group_url(groups[0]))
+        # Чтение поднимает ленту, первой вытесняется groups[0].
+        self.page_ids(self.group_url(self.group))
+        self.page_ids(self.group_url(groups[1]))
+        self.page_ids(self.group_url(groups[2]))
+        cached = caches['timelines'].get_many([
+            'posts:timeline:' + timelines.group_timeline(group.pk)
+            for group in [self.group] + groups
+        ])
+        self.assertEqual(len(cached), 3)
+        self.assertIn(
+            'posts:timeline:' + timelines.group_timeline(self.group.pk),
+            cached,
+        )
+        self.assertNotIn(
+            'posts:timeline:' + timelines.group_timeline(groups[0].pk),
+            cached,
+        )
+
+
+class PageIdsTests(TestCase):
+    def test_incomplete_timeline_does_not_cover_tail(self):
+        entries = [(i, i) for i in range(5)]
+        self.assertEqual(timelines.page_ids((entries, False), 0, 3), [4, 3, 2])
+        self.assertIsNone(timelines.page_ids((entries, False), 3, 6))
+        self.assertEqual(timelines.page_ids((entries, True), 3, 6), [1, 0])
+        self.assertEqual(timelines.page_ids((entries, True), 6, 9), [])
@@ -0,0 +1,20 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def query_plans(func):
+    """[(sql, план EXPLAIN QUERY PLAN)] запросов, выполненных func().
+
+    Только для SQLite: строки плана склеиваются через « | ».
+    """
+    with CaptureQueriesContext(connection) as context:
+        func()
+    plans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            cursor.execute(f'EXPLAIN QUERY PLAN {query["sql"]}')
+            plans.append((
+                query['sql'],
+                ' | '.join(row[-1] for row in cursor.fetchall()),
+            ))
+    return plans
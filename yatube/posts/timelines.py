@@ -0,0 +1,205 @@
+"""Материализованные ленты: последние посты ленты в кеше.
+
+Ленты есть у главной, каждой группы и каждого автора. Лента хранит
+до POSTS_TIMELINE_SIZE пар (pub_date, id) и поддерживается сигналами
+при создании, переносе между группами и удалении постов. Страницы,
+которые она покрывает, собираются выборкой по id без сортировки
+таблицы постов, более старые берутся из базы как раньше. Ленты лежат
+в кеше POSTS_TIMELINE_CACHE: memcached или LocMemCache с MAX_ENTRIES
+вытесняют давно не читавшиеся ленты. Сигналы обновляют ленты только
+в кеше процесса, обработавшего запись, поэтому нескольким процессам
+нужен общий кеш, например memcached (проверка posts.W001).
+"""
+import bisect
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from core import routers
+
+from .cache import INDEX_FEED
+from .counters import CountedPaginator
+
+LOCK_TIMEOUT = 5
+
+
+def enabled():
+    return settings.POSTS_TIMELINES
+
+
+def _cache():
+    return caches[settings.POSTS_TIMELINE_CACHE]
+
+
+def _key(feed):
+    return f'posts:timeline:{feed}'
+
+
+def group_timeline(group_id):
+    # Ключи лент по id, а не по slug и username: переименование
+    # не меняет состав ленты.
+    return f'group:{group_id}'
+
+
+def author_timeline(author_id):
+    return f'author:{author_id}'
+
+
+def post_timelines(post):
+    """Ключи материализованных лент, в которые попадает пост."""
+    feeds = [INDEX_FEED, author_timeline(post.author_id)]
+    if post.group_id is not None:
+        feeds.append(group_timeline(post.group_id))
+    return feeds
+
+
+def build(queryset):
+    """Собирает ленту из базы: (записи от старых к новым, полная ли она)."""
+    size = settings.POSTS_TIMELINE_SIZE
+    rows = list(
+        queryset.order_by('-pub_date', '-pk').
+        values_list('pub_date', 'pk')[:size + 1]
+    )
+    entries = rows[:size]
+    entries.reverse()
+    return entries, len(rows) <= size
+
+
+def load(feed, queryset):
+    timeline = _cache().get(_key(feed))
+    if timeline is None:
+        # Лента переживёт запрос, поэтому собирается по основной базе.
+        with routers.read_primary():
+            timeline = build(queryset)
+        _cache().add(
+            _key(feed), timeline, timeout=settings.POSTS_TIMELINE_TIMEOUT
+        )
+    return timeline
+
+
+def drop(feeds):
+    if enabled():
+        _cache().delete_many([_key(feed) for feed in feeds])
+
+
+def _update(feed, change):
+    """Меняет закешированную ленту под блокировкой.
+
+    Блокировка — ключ, поставленный cache.add(): в общем кеше
+    (memcached) она действует на все процессы, в LocMemCache — только
+    на потоки одного процесса. Если блокировку уже держат, лента
+    сбрасывается и при следующем чтении собирается из базы заново.
+    """
+    timeline_cache = _cache()
+    key = _key(feed)
+    lock_key = f'{key}:lock'
+    if not timeline_cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        timeline_cache.delete(key)
+        return
+    try:
+        timeline = timeline_cache.get(key)
+        if timeline is not None:
+            timeline_cache.set(
+                key,
+                change(*timeline),
+                timeout=settings.POSTS_TIMELINE_TIMEOUT,
+            )
+    finally:
+        timeline_cache.delete(lock_key)
+
+
+def _insert(entry):
+    def change(entries, complete):
+        if entry in entries:
+            return entries, complete
+        bisect.insort(entries, entry)
+        size = settings.POSTS_TIMELINE_SIZE
+        if len(entries) > size:
+            return entries[-size:], False
+        return entries, complete
+    return change
+
+
+def _remove(pk):
+    def change(entries, complete):
+        return [entry for entry in entries if entry[1] != pk], complete
+    return change
+
+
+def _apply(feeds, change):
+    for feed in feeds:
+        _update(feed, change)
+    # Лента, собранная из базы до коммита, могла не увидеть пост,
+    # поэтому после коммита изменение повторяется: оно идемпотентно.
+    transaction.on_commit(lambda: [_update(feed, change) for feed in feeds])
+
+
+def add_post(post):
+    if enabled():
+        _apply(post_timelines(post), _insert((post.pub_date, post.pk)))
+
+
+def remove_post(post):
+    if enabled():
+        _apply(post_timelines(post), _remove(post.pk))
+
+
+def move_post(post, previous_group_id):
+    """Переносит пост между лентами групп после смены группы."""
+    if not enabled():
+        return
+    if previous_group_id is not None:
+        _apply([group_timeline(previous_group_id)], _remove(post.pk))
+    if post.group_id is not None:
+        _apply(
+            [group_timeline(post.group_id)],
+            _insert((post.pub_date, post.pk)),
+        )
+
+
+def page_ids(timeline, start, stop):
+    """id постов [start:stop) ленты, None — если лента их не покрывает."""
+    entries, complete = timeline
+    if stop > len(entries) and not complete:
+        return None
+    window = entries[max(len(entries) - stop, 0):max(len(entries) - start, 0)]
+    return [pk for _, pk in reversed(window)]
+
+
+def timeline_posts(feed, queryset, start, stop):
+    """Посты [start:stop) ленты по материализованной ленте или None."""
+    ids = page_ids(load(feed, queryset), start, stop)
+    if ids is None:
+        return None
+    posts = queryset.in_bulk(ids)
+    if len(posts) != len(ids):
+        # Реплика могла ещё не получить новый пост, тогда страница
+        # берётся из базы. С основной базы это id поста из откатившейся
+        # транзакции, и лента собирается заново.
+        if not routers.reads_replica():
+            drop([feed])
+        return None
+    return [posts[pk] for pk in ids]
+
+
+class TimelinePaginator(CountedPaginator):
+    """CountedPaginator, отдающий первые страницы из материализованной ленты.
+
+    Страницы, которые лента не покрывает, выбираются из базы обычным
+    OFFSET-запросом.
+    """
+
+    def __init__(self, object_list, per_page, count, feed, **kwargs):
+        super().__init__(object_list, per_page, count, **kwargs)
+        self.feed = feed
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        posts = timeline_posts(
+            self.feed, self.object_list, bottom, bottom + self.per_page
+        )
+        if posts is None:
+            return super().page(number)
+        return self._get_page(posts, number, self)
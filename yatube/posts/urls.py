@@ -21,6 +21,21 @@ urlpatterns = [
         views.profile,
         name='profile'
     ),
+    path(
+        'export/',
+        views.export_posts,
+        name='export'
+    ),
+    path(
+        'api/posts/changes/',
+        views.post_changes,
+        name='post_changes'
+    ),
+    path(
+        'search/',
+        views.search,
+        name='search'
+    ),
     path(
         'posts/<int:post_id>/',
         views.post_detail,
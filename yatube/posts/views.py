@@ -1,36 +1,90 @@
-from django.shortcuts import render, get_object_or_404, redirect
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.core.paginator import Paginator
+from django.http import (
+    HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+)
+from django.db import transaction
+from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 
+from core.routers import use_replica
+
 from .models import Post, Group, User
+from . import changes, conditional, export, timelines
 from .forms import PostForm
+from .cache import author_feed, cache_feed_page, group_feed, index_feed
+from .conditional import conditional_feed
+from .counters import CountedPaginator, INDEX_FEED, author_stats, get_count
+from .paginators import CursorPaginator
+from .search import search_posts
+from .timelines import TimelinePaginator
+
+POSTS_PER_PAGE = 10
+
+
+def use_cursor_pagination(request):
+    if 'after' in request.GET or 'before' in request.GET:
+        return True
+    return settings.POSTS_CURSOR_PAGINATION and 'page' not in request.GET
+
 
+def feed_posts(queryset):
+    """Посты ленты: строки PostRow при POSTS_FEED_ROWS, иначе модели."""
+    if settings.POSTS_FEED_ROWS:
+        return queryset.feed_rows()
+    return queryset.for_feed()
 
-def create_page_obj(request, post_list):
-    paginator = Paginator(post_list, 10)
+
+def create_page_obj(request, post_list, count, timeline=None):
+    """Страница ленты; timeline — ключ материализованной ленты."""
+    if use_cursor_pagination(request):
+        paginator = CursorPaginator(post_list, POSTS_PER_PAGE)
+        return paginator.get_page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
+    if timeline is not None and timelines.enabled():
+        paginator = TimelinePaginator(
+            post_list, POSTS_PER_PAGE, count, timeline
+        )
+    else:
+        paginator = CountedPaginator(post_list, POSTS_PER_PAGE, count)
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
 
 
+@use_replica
+@conditional_feed(index_feed)
+@cache_feed_page(index_feed)
 def index(request):
-    post_list = (
-        Post.objects.select_related('group').
-        order_by('-pub_date')
+    post_list = feed_posts(Post.objects.all())
+    page_obj = create_page_obj(
+        request,
+        post_list,
+        lambda: get_count(INDEX_FEED, post_list),
+        timeline=INDEX_FEED,
     )
-    page_obj = create_page_obj(request, post_list)
     context = {
         'page_obj': page_obj,
     }
     return render(request, 'posts/index.html', context)
 
 
+@use_replica
+@conditional_feed(group_feed)
+@cache_feed_page(group_feed)
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    post_list = (
-        group.posts.select_related('group').
-        order_by('-pub_date')
+    post_list = feed_posts(group.posts.all())
+    page_obj = create_page_obj(
+        request,
+        post_list,
+        group.posts_count,
+        timeline=timelines.group_timeline(group.pk),
     )
-    page_obj = create_page_obj(request, post_list)
     context = {
         'group': group,
         'page_obj': page_obj,
@@ -38,13 +92,18 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+@use_replica
+@conditional_feed(author_feed)
+@cache_feed_page(author_feed)
 def profile(request, username):
-    author = User.objects.get(username=username)
-    post_list = (
-        author.posts.select_related('group').
-        order_by('-pub_date')
+    author = User.objects.select_related('post_stats').get(username=username)
+    post_list = feed_posts(author.posts.all())
+    page_obj = create_page_obj(
+        request,
+        post_list,
+        author_stats(author).posts_count,
+        timeline=timelines.author_timeline(author.pk),
     )
-    page_obj = create_page_obj(request, post_list)
     context = {
         'author': author,
         'page_obj': page_obj,
@@ -52,12 +111,46 @@ def profile(request, username):
     return render(request, 'posts/profile.html', context)
 
 
+@use_replica
+def search(request):
+    query = request.GET.get('q', '').strip()
+    paginator = Paginator(search_posts(query), POSTS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+        'query_prefix': urlencode({'q': query}) + '&',
+    }
+    return render(request, 'posts/search.html', context)
+
+
+@use_replica
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author__post_stats', 'group'),
+        pk=post_id,
+    )
+    posts_count = author_stats(post.author).posts_count
+    use_validators = conditional.enabled(request)
+    if use_validators:
+        etag = conditional.make_etag(
+            post.pk,
+            post.version,
+            posts_count,
+            conditional.user_key(request),
+        )
+        # Целые секунды, как в If-Modified-Since, иначе 304 не совпадёт.
+        last_modified = int(post.updated_at.timestamp())
+        response = conditional.not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
     context = {
         'post': post,
     }
-    return render(request, 'posts/post_detail.html', context)
+    response = render(request, 'posts/post_detail.html', context)
+    if use_validators:
+        conditional.add_validators(request, response, etag, last_modified)
+    return response
 
 
 @login_required
@@ -68,7 +161,8 @@ def post_create(request):
             instance = form.save(commit=False)
             username = request.user
             instance.author = username
-            instance.save()
+            with transaction.atomic():
+                instance.save()
             return redirect('posts:profile', username)
         return render(
             request,
@@ -85,12 +179,13 @@ def post_create(request):
 @login_required
 def post_edit(request, post_id):
     post = get_object_or_404(Post, id=post_id)
-    if request.user != post.author:
+    if request.user.pk != post.author_id:
         return redirect(f'/posts/{post_id}/')
     form = PostForm(request.POST or None, instance=post)
     if request.method == 'POST':
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
             return redirect('posts:post_detail', post_id)
         return render(
             request,
@@ -102,3 +197,42 @@ def post_edit(request, post_id):
         'posts/create_post.html',
         {'form': form, 'is_edit': True, 'post': post}
     )
+
+
+@staff_member_required
+def export_posts(request):
+    export_format = request.GET.get('format', 'jsonl')
+    if export_format not in export.FORMATS:
+        return HttpResponseBadRequest('Неизвестный формат выгрузки.')
+    filters = {
+        name: request.GET.get(name)
+        for name in ('author', 'group', 'since', 'until')
+    }
+    try:
+        for name in ('since', 'until'):
+            if filters[name]:
+                export.parse_moment(filters[name])
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    response = StreamingHttpResponse(
+        export.render(export.export_rows(**filters), export_format),
+        content_type=export.FORMATS[export_format],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="posts.{export_format}"'
+    )
+    return response
+
+
+def post_changes(request):
+    """Правки и удаления постов после водяного знака ?since= по порядку."""
+    try:
+        since = changes.parse_since(request.GET.get('since'))
+        limit = changes.parse_limit(request.GET.get('limit'))
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    posts, next_token, has_more = changes.changed_posts(since, limit)
+    return JsonResponse(
+        {'posts': posts, 'next': next_token, 'has_more': has_more},
+        json_dumps_params={'ensure_ascii': False},
+    )
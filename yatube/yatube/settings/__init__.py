@@ -0,0 +1,20 @@
+"""Настройки проекта. Профиль выбирается переменной окружения YATUBE_ENV:
+
+    dev  — локальная разработка (по умолчанию);
+    test — прогон тестов;
+    prod — продакшен, SECRET_KEY и ALLOWED_HOSTS берутся из окружения.
+
+Профиль можно указать и напрямую: DJANGO_SETTINGS_MODULE=yatube.settings.prod.
+"""
+import os
+
+YATUBE_ENV = os.environ.get('YATUBE_ENV', 'dev')
+
+if YATUBE_ENV == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif YATUBE_ENV == 'test':
+    from .test import *  # noqa: F401,F403
+elif YATUBE_ENV == 'dev':
+    from .dev import *  # noqa: F401,F403
+else:
+    raise ImportError(f'Неизвестный профиль настроек YATUBE_ENV={YATUBE_ENV}')
@@ -0,0 +1,288 @@
+"""Общие настройки всех профилей (dev, test, prod)."""
+import os
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+# Deployment checklist
+# See https://docs.djangoproject.com/en/2.2/howto/deployment/checklist/
+
+SECRET_KEY = os.environ.get('SECRET_KEY')
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '').split()
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'posts.apps.PostsConfig',
+    'users.apps.UsersConfig',
+    'core.apps.CoreConfig',
+    'about.apps.AboutConfig',
+]
+
+MIDDLEWARE = [
+    'core.middleware.static.StaticFilesMiddleware',
+    'core.middleware.compression.CompressionMiddleware',
+    'core.middleware.performance.PerformanceMiddleware',
+    'core.middleware.queries.QueryInspectorMiddleware',
+    'core.middleware.replicas.ReplicaMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+        },
+    },
+]
+
+# Профиль шаблонов и include на каждый запрос в Server-Timing
+# и логе core.templates (core.middleware.performance).
+TEMPLATE_PROFILING = False
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/2.2/ref/settings/#databases
+
+# DB_ENGINE=postgresql переключает на PostgreSQL (нужен psycopg2),
+# параметры подключения берутся из DB_NAME, DB_USER, DB_PASSWORD,
+# DB_HOST и DB_PORT. CONN_MAX_AGE держит соединение между запросами.
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite3')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'yatube'),
+            'USER': os.environ.get('DB_USER', 'yatube'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get(
+                'DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')
+            ),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        }
+    }
+
+# Реплики только для чтения: DB_REPLICAS — через пробел файлы SQLite
+# или хосты PostgreSQL (host[:port]). Ленты, посты и about читаются
+# с реплик (core.routers), запись и остальные страницы — с основной базы.
+DATABASE_REPLICAS = []
+
+for number, replica in enumerate(os.environ.get('DB_REPLICAS', '').split(), 1):
+    alias = f'replica{number}'
+    if DB_ENGINE == 'postgresql':
+        host, _, port = replica.partition(':')
+        DATABASES[alias] = {
+            **DATABASES['default'],
+            'HOST': host,
+            'PORT': port or DATABASES['default']['PORT'],
+        }
+    else:
+        DATABASES[alias] = {**DATABASES['default'], 'NAME': replica}
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Сколько секунд после записи клиент читает с основной базы.
+DATABASE_REPLICA_PIN_SECONDS = 10
+
+# PRAGMA для каждого нового соединения SQLite (core.db). WAL позволяет
+# читать, пока идёт запись, busy_timeout ждёт блокировку вместо ошибки.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+
+# template_fragments хранит фрагменты постов из тега {% cache %};
+# DummyCache выключает их, для включения укажите настоящий бэкенд.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    },
+    # Материализованные ленты (posts.timelines). MAX_ENTRIES ограничивает
+    # число лент в памяти, LocMemCache вытесняет давно не читавшиеся.
+    'timelines': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'timelines',
+        'OPTIONS': {'MAX_ENTRIES': 1000, 'CULL_FREQUENCY': 10},
+    },
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.'
+        'auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.'
+        'auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.'
+        'auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.'
+        'auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru-Ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.2/howto/static-files/
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+
+STATIC_ROOT = os.environ.get(
+    'STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles')
+)
+
+# True — собранную статику из STATIC_ROOT отдаёт StaticFilesMiddleware:
+# сжатые копии по Accept-Encoding, вечный кеш для файлов с хешем в имени.
+SERVE_STATIC = False
+
+# max-age статики без хеша в имени, например favicon по прямой ссылке.
+STATIC_MAX_AGE = 60 * 60
+
+# Сжатие ответов brotli (если установлен пакет brotli) или gzip.
+# Короче RESPONSE_COMPRESSION_MIN_SIZE байт ответы не сжимаются.
+RESPONSE_COMPRESSION = False
+RESPONSE_COMPRESSION_MIN_SIZE = 200
+RESPONSE_COMPRESSION_GZIP_LEVEL = 6
+RESPONSE_COMPRESSION_BROTLI_QUALITY = 4
+# Потоковый ответ выталкивает сжатое каждые столько байт исходного тела:
+# меньше — раньше приходят первые байты, больше — лучше сжатие.
+RESPONSE_COMPRESSION_FLUSH_SIZE = 8192
+
+LOGIN_URL = 'users:login'
+
+LOGIN_REDIRECT_URL = 'posts:index'
+
+# LOGOUT_REDIRECT_URL = 'posts:index'
+
+# True — ленты по умолчанию листаются keyset-пагинатором (?after=/?before=),
+# ссылки с номером страницы (?page=) продолжают работать.
+POSTS_CURSOR_PAGINATION = False
+
+# Кеш отрендеренных страниц лент для гостей. Страницы ленты сбрасываются
+# сигналами при изменении её постов, таймаут лишь чистит старые версии.
+# Нескольким процессам нужен общий кеш default, иначе сброс увидит только
+# процесс, обработавший запись (проверка posts.W001).
+POSTS_PAGE_CACHE = False
+
+POSTS_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# ETag/Last-Modified и ответы 304 для лент и постов (posts.conditional).
+# Валидаторы лент берутся из версий лент в кеше, как и кеш страниц,
+# поэтому нескольким процессам нужен общий кеш default: иначе воркер,
+# не видевший сброса, ответит 304 на изменившуюся ленту.
+POSTS_CONDITIONAL_GET = False
+
+# max-age в Cache-Control страниц для гостей: 0 — CDN и браузер
+# переспрашивают страницу каждый раз, получая 304, если она не менялась.
+POSTS_HTTP_MAX_AGE = 0
+
+# Ленты строками PostRow (posts.rows) вместо экземпляров Post, User
+# и Group: меньше памяти и времени на страницу. В контексте шаблона
+# page_obj тогда содержит PostRow, а не модели.
+POSTS_FEED_ROWS = False
+
+# Материализованные ленты главной, групп и авторов (posts.timelines):
+# id последних POSTS_TIMELINE_SIZE постов в кеше, первые страницы без
+# сортировки таблицы. Таймаут ограничивает жизнь ленты, разошедшейся
+# с базой. Нескольким процессам нужен общий кеш POSTS_TIMELINE_CACHE.
+POSTS_TIMELINES = False
+
+POSTS_TIMELINE_CACHE = 'timelines'
+
+POSTS_TIMELINE_SIZE = 200
+
+POSTS_TIMELINE_TIMEOUT = 60 * 10
+
+# /api/posts/changes/ не отдаёт изменения моложе этого числа секунд,
+# чтобы успели закоммититься транзакции, начатые раньше.
+POSTS_CHANGES_SETTLE_SECONDS = 5
+
+# Поиск повторяющихся и медленных SQL-запросов (core.queries).
+# Доля проверяемых запросов от 0 до 1, 0 выключает проверку.
+QUERY_INSPECTOR_SAMPLE_RATE = 0
+
+# Сколько одинаковых с точностью до значений запросов считать повтором.
+QUERY_INSPECTOR_DUPLICATES = 3
+
+QUERY_INSPECTOR_SLOW_QUERY_MS = 100
+
+QUERY_INSPECTOR_SLOW_REQUEST_MS = 500
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
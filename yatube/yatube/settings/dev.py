@@ -0,0 +1,17 @@
+"""Локальная разработка: DEBUG и SQLite рядом с проектом."""
+import os
+
+from .base import *  # noqa: F401,F403
+
+SECRET_KEY = os.environ.get(
+    'SECRET_KEY', '%(o=2%zl=b5a@3sxr6=rm0plz6li1$&=r0n!1qzda!60t*&cw!'
+)
+
+DEBUG = True
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+]
@@ -0,0 +1,75 @@
+"""Продакшен: SECRET_KEY и ALLOWED_HOSTS обязательно задаются окружением."""
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import TEMPLATES
+
+SECRET_KEY = os.environ['SECRET_KEY']
+
+# Шаблоны разбираются один раз на процесс, а не на каждый рендер.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+# Кеш страниц, версии лент (из них же ETag и Last-Modified лент)
+# и материализованные ленты должны быть общими для всех воркеров:
+# сигналы обновляют их только в процессе, обработавшем запись.
+# CACHE_LOCATION — адреса memcached через запятую (нужен пакет
+# python-memcached); без него кеши в памяти, а эти функции выключены.
+CACHE_LOCATION = os.environ.get('CACHE_LOCATION')
+
+if CACHE_LOCATION:
+    DEFAULT_CACHE = {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': CACHE_LOCATION.split(','),
+    }
+    TIMELINES_CACHE = {**DEFAULT_CACHE, 'KEY_PREFIX': 'timelines'}
+else:
+    DEFAULT_CACHE = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+    TIMELINES_CACHE = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'timelines',
+        'OPTIONS': {'MAX_ENTRIES': 5000, 'CULL_FREQUENCY': 10},
+    }
+
+CACHES = {
+    'default': DEFAULT_CACHE,
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'template-fragments',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+    'timelines': TIMELINES_CACHE,
+}
+
+# collectstatic добавляет хеш содержимого в имена и кладёт рядом .gz/.br.
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+SERVE_STATIC = True
+
+RESPONSE_COMPRESSION = True
+
+POSTS_PAGE_CACHE = bool(CACHE_LOCATION)
+
+POSTS_CONDITIONAL_GET = bool(CACHE_LOCATION)
+
+POSTS_TIMELINES = bool(CACHE_LOCATION)
+
+POSTS_FEED_ROWS = True
+
+QUERY_INSPECTOR_SAMPLE_RATE = 0.01
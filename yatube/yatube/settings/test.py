@@ -0,0 +1,35 @@
+"""Прогон тестов: быстрые хеши паролей и кеши без состояния между тестами."""
+from .dev import *  # noqa: F401,F403
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    },
+    'timelines': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'timelines',
+    },
+}
+
+SQLITE_PRAGMAS = {}
+
+# Реплика-зеркало основной тестовой базы для тестов core.routers,
+# по умолчанию маршрутизация на реплики выключена.
+DATABASES = {
+    **DATABASES,  # noqa: F405
+    'replica': {
+        **DATABASES['default'],  # noqa: F405
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_REPLICAS = []